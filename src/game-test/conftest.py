@@ -1,7 +1,38 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Garantir que o diretório src/ (pai deste teste) esteja no sys.path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from game import questions  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Diretório de pools temporário, com o cache de perguntas limpo antes e depois."""
+    monkeypatch.setattr(questions, "DATA_DIR", tmp_path)
+    questions.clear_question_cache()
+    yield tmp_path
+    questions.clear_question_cache()
+
+
+@pytest.fixture
+def make_pool():
+    """Pools sintéticos: ids 1..n, dificuldade 1 + id % 5 e tag "par" nos ids pares."""
+
+    def make(n=50, tags=True):
+        pool = [
+            {"id": i, "question": f"Pergunta ção {i}?", "answer": str(i * 2), "explanation": "expl",
+             "difficulty": 1 + i % 5}
+            for i in range(1, n + 1)
+        ]
+        if tags:
+            for q in pool:
+                q["tags"] = ["par"] if q["id"] % 2 == 0 else []
+        return pool
+
+    return make
@@ -0,0 +1,36 @@
+import pytest
+
+from game.entities import Player, Vector2
+from game.input import InputState, compute_direction
+
+np = pytest.importorskip("numpy")
+
+from game.agents import AgentStore  # noqa: E402
+
+
+def test_step_matches_player_move_for_every_agent():
+    store = AgentStore(capacity=2)
+    store.add_many([(i, 2 * i) for i in range(1000)], speed=10.0)
+    assert len(store) == 1000
+    keys = np.arange(1000)
+    store.apply_inputs(left=keys % 4 == 0, right=keys % 4 == 1, up=keys % 3 == 0, down=False)
+    store.step(0.5)
+    for i in (0, 1, 2, 3, 999):
+        s = InputState()
+        s.left, s.right, s.up = i % 4 == 0, i % 4 == 1, i % 3 == 0
+        p = Player(pos=Vector2(i, 2 * i), speed=10.0)
+        p.move(*compute_direction(s), 0.5)
+        assert tuple(store.pos[i]) == (p.pos.x, p.pos.y)
+
+
+def test_player_view_reads_and_writes_the_store():
+    store = AgentStore()
+    i = store.add(5.0, 6.0, speed=4.0)
+    view = store.player(i)
+    assert isinstance(view, Player) and isinstance(view.pos, Vector2)
+    view.move(1.0, -1.0, 0.5)
+    assert (view.pos.x, view.pos.y) == (7.0, 4.0)
+    assert tuple(store.pos[i]) == (7.0, 4.0)
+    view.pos.x = 0.0
+    view.speed = 1.0
+    assert store.pos[i, 0] == 0.0 and store.speed[i] == 1.0
@@ -0,0 +1,24 @@
+import random
+
+from game.answers import correct_index, is_answer_correct, is_choice_correct, prepare_question
+from game.questions import sample_questions
+
+
+def test_prepare_question_precomputes_grading_fields():
+    q = prepare_question({"answer": " Int ", "choices": ["str", "INT", "list", "int "]})
+    assert q["answer_norm"] == "int"
+    assert q["correct_index"] == 1
+    assert [is_choice_correct(q, i) for i in range(5)] == [False, True, False, True, False]
+    assert not is_choice_correct(q, None)
+    assert is_answer_correct(q, "iNt")
+
+
+def test_unprepared_questions_still_work():
+    q = {"answer": "4", "choices": ["3", "4", "5"]}
+    assert correct_index(q) == 1
+    assert is_answer_correct({"answer": "sim"}, " SIM ")
+
+
+def test_sampled_questions_come_prepared():
+    for q in sample_questions("math", random.Random(2), count=3):
+        assert q["choices"][q["correct_index"]] == q["answer"]
@@ -10,6 +10,52 @@ def test_generate_map():
     assert len(m.rooms) == 10
 
 
+def test_generate_map_reports_overlap_fallbacks():
+    def overlaps(a, b):
+        return not (a.x + a.w < b.x or b.x + b.w < a.x or a.y + a.h < b.y or b.y + b.h < a.y)
+
+    # mundo grande: grade de ocupação em uso e nenhuma sala sobreposta
+    m = generate_map(5, num_rooms=150, width=4000, height=4000)
+    assert m == generate_map(5, num_rooms=150, width=4000, height=4000)
+    assert m.overlap_fallbacks == 0
+    assert not any(overlaps(a, b) for i, a in enumerate(m.rooms) for b in m.rooms[i + 1:])
+    # mundo padrão lotado: o excedente é sobreposto e contado
+    crowded = generate_map(5, num_rooms=150)
+    assert len(crowded.rooms) == 150
+    assert 100 < crowded.overlap_fallbacks < 150
+
+
+def test_generate_map_matches_original_linear_placement():
+    import random
+
+    def original(seed, num_rooms, width, height):
+        # algoritmo original: varredura linear e rng.randint a cada sorteio
+        rng = random.Random(seed)
+        rooms, placed = [], []
+
+        def draw():
+            w = rng.randint(80, 160)
+            h = rng.randint(60, 140)
+            return rng.randint(10, max(10, width - w - 10)), rng.randint(10, max(10, height - h - 10)), w, h
+
+        for i in range(num_rooms):
+            theme = rng.choice(["math", "logic", "python"])
+            for _ in range(200):
+                x, y, w, h = draw()
+                if all(x + w < ox or ox + ow < x or y + h < oy or oy + oh < y for ox, oy, ow, oh in placed):
+                    placed.append((x, y, w, h))
+                    break
+            else:
+                x, y, w, h = draw()
+            rooms.append((i, theme, x, y, w, h))
+        return rooms
+
+    for seed in range(6):
+        for n, width, height in [(10, 800, 600), (120, 800, 600), (200, 4000, 4000)]:
+            m = generate_map(seed, num_rooms=n, width=width, height=height)
+            assert [(r.id, r.theme, r.x, r.y, r.w, r.h) for r in m.rooms] == original(seed, n, width, height)
+
+
 def test_room_enter_and_questions():
     reset_for_tests()
     _GS.start_game(seed=321, num_rooms=5)
@@ -24,3 +70,92 @@ def test_room_enter_and_questions():
     answers = [q['answer'] for q in qs]
     success, correct_count, pts, details = ask_room_questions(desc2.theme, answers)
     assert isinstance(success, bool)
+
+
+def test_compact_map_matches_and_works_with_game_state():
+    from game.mapgen import CompactMapDescriptor, generate_compact_map
+
+    m = generate_map(9, num_rooms=60)
+    c = generate_compact_map(9, num_rooms=60)
+    assert c.to_map() == m
+    assert c.overlap_fallbacks == m.overlap_fallbacks
+    assert list(c.rooms) == m.rooms
+    assert c.rooms[-1].name == m.rooms[-1].name
+    m.rooms[0].name = "Entrada"
+    assert CompactMapDescriptor.from_map(m).rooms[0].name == "Entrada"
+
+    # outro teste recarrega game.game: buscar o estado global atual
+    import game.game as game_mod
+
+    gs = game_mod._GS
+    game_mod.reset_for_tests()
+    gs.map = generate_compact_map(9, num_rooms=5)
+    gs.goto_room(3)
+    assert gs.current_room.info()["name"] == "Sala 4"
+    can, desc = game_mod.enter_room(0)
+    assert can and desc.required_score == 0
+
+
+def test_room_lookup_by_id_stays_consistent():
+    import game.game as game_mod
+    from game.mapcache import get_map
+    from game.mapgen import RoomDescriptor
+
+    gs = game_mod.GameState()
+    gs.start_game(seed=4, num_rooms=20)
+    assert gs.room_by_id(7) is gs.map.rooms[7]
+    assert gs.room_by_id(99) is None
+    extra = RoomDescriptor(id=99, name="Extra", required_score=0, owner_npc="NPC", theme="math", x=1, y=1, w=5, h=5)
+    gs.add_room(extra)
+    assert gs.room_by_id(99) is extra
+    gs.goto_room(99)
+    assert gs.current_room.info()["name"] == "Extra"
+    # o mapa em cache não foi alterado
+    assert len(get_map(4, num_rooms=20).rooms) == 20
+    # trocar o mapa por fora também reindexa
+    gs.map = generate_map(5, num_rooms=3)
+    assert gs.room_by_id(99) is None and gs.room_by_id(2) is gs.map.rooms[2]
+
+
+def test_add_room_copies_shared_compact_map():
+    import game.game as game_mod
+    from game.mapgen import RoomDescriptor, RoomView, generate_compact_map
+
+    shared = generate_compact_map(4, num_rooms=20)
+    gs = game_mod.GameState()
+    gs.map = shared
+    assert isinstance(gs.room_by_id(7), RoomView) and gs.room_by_id(7).id == 7
+    # ids densos: o índice não guarda nada por sala
+    assert gs._room_rows is None
+    extra = RoomDescriptor(id=99, name="Extra", required_score=0, owner_npc="NPC", theme="math", x=1, y=1, w=5, h=5)
+    added = gs.add_room(extra)
+    assert gs.map is not shared and len(shared.rooms) == 20
+    assert added == extra and gs.room_by_id(99) == extra
+    assert gs.room_by_id(19).to_descriptor() == shared.rooms[19].to_descriptor()
+    assert gs.room_by_id(20) is None
+
+
+def test_room_locator_matches_linear_scan_with_overlaps():
+    import random
+
+    from game.mapgen import RoomLocator, generate_compact_map
+
+    def linear(rooms, px, py):
+        for r in rooms:
+            if r.x <= px <= r.x + r.w and r.y <= py <= r.y + r.h:
+                return r
+        return None
+
+    m = generate_map(8, num_rooms=120)
+    assert m.overlap_fallbacks > 0
+    locator = RoomLocator(m.rooms)
+    rng = random.Random(0)
+    points = [(rng.randint(0, 820), rng.randint(0, 620)) for _ in range(3000)]
+    # bordas exatas das salas
+    points += [(r.x + r.w, r.y + r.h) for r in m.rooms] + [(r.x, r.y) for r in m.rooms]
+    for px, py in points:
+        assert locator.room_at(px, py) is linear(m.rooms, px, py)
+    compact = generate_compact_map(8, num_rooms=120)
+    located = RoomLocator(compact.rooms).room_at(*points[0])
+    expected = linear(m.rooms, *points[0])
+    assert (located is None and expected is None) or located.id == expected.id
@@ -0,0 +1,13 @@
+from game.mapbatch import generate_maps, read_maps, write_maps
+from game.mapgen import generate_map
+
+
+def test_batch_matches_serial_generation_in_seed_order(tmp_path):
+    seeds = [7, 3, 11, 0, 5]
+    expected = [generate_map(s, num_rooms=12) for s in seeds]
+    assert list(generate_maps(seeds, num_rooms=12, workers=2, chunk_size=2)) == expected
+    assert list(generate_maps(iter(seeds), num_rooms=12, workers=1)) == expected
+    path = tmp_path / "maps.bin"
+    with open(path, "wb") as f:
+        assert write_maps(f, expected) == 5
+    assert list(read_maps(path)) == expected
@@ -0,0 +1,37 @@
+from game.mapcache import MapCache, decode_map, encode_map
+from game.mapgen import generate_map
+
+
+def test_encode_decode_roundtrip():
+    m = generate_map(11, num_rooms=40)
+    assert decode_map(encode_map(m)) == m
+
+
+def test_lru_and_disk_cache(tmp_path):
+    cache = MapCache(maxsize=2, cache_dir=tmp_path)
+    a = cache.get(1, 10)
+    assert cache.get(1, 10) is a
+    assert a == generate_map(1, num_rooms=10)
+    cache.get(2, 10)
+    cache.get(3, 10)
+    assert len(cache) == 2 and cache.misses == 3
+    # o mapa 1 saiu do LRU, mas volta do disco sem ser gerado de novo
+    again = MapCache(cache_dir=tmp_path).get(1, 10)
+    assert again == a
+    cache.get(1, 10)
+    assert cache.disk_hits == 1 and cache.misses == 3
+
+
+def test_corrupt_disk_entry_is_regenerated(tmp_path):
+    cache = MapCache(cache_dir=tmp_path)
+    m = cache.get(5, 8)
+    for path in tmp_path.iterdir():
+        path.write_bytes(b"lixo")
+    assert MapCache(cache_dir=tmp_path).get(5, 8) == m
+
+
+def test_custom_names_survive_encoding():
+    m = generate_map(2, num_rooms=3)
+    m.rooms[1].name = "Biblioteca"
+    assert decode_map(encode_map(m)) == m
+    assert len(encode_map(m)) > len(encode_map(generate_map(2, num_rooms=3)))
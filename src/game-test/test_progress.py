@@ -0,0 +1,26 @@
+from game.progress import ProgressTracker
+
+
+def test_progress_tracks_books_and_guardians():
+    p = ProgressTracker()
+    p.add_book(2)
+    p.add_book(3)
+    p.add_guardian(3)
+    p.add_guardian(2)
+    assert p.max_possible(0) == 10
+    p.book_read(2)
+    p.guardian_defeated(3)
+    assert p.unread_book_points == 3
+    assert p.remaining_questions == 2
+    assert not p.all_guardians_defeated()
+    p.guardian_defeated(2)
+    assert p.all_guardians_defeated()
+    assert p.max_possible(7) == 10
+
+
+def test_progress_ignores_already_done_entities():
+    p = ProgressTracker()
+    p.add_book(5, read=True)
+    p.add_guardian(3, defeated=True)
+    assert p.max_possible(0) == 0
+    assert p.all_guardians_defeated()
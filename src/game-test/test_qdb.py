@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from game import questions
+from game.qdb import QuestionDB
+
+
+def test_import_and_filtered_sampling(make_pool):
+    db = QuestionDB()
+    assert db.import_questions("math", make_pool()) == 50
+    assert db.count("math") == 50
+    qs = db.sample("math", random.Random(1), count=5, min_difficulty=2, max_difficulty=3, tags=["par"])
+    assert len(qs) == 5
+    assert all(2 <= q["difficulty"] <= 3 and q["id"] % 2 == 0 for q in qs)
+    assert qs == db.sample("math", random.Random(1), count=5, min_difficulty=2, max_difficulty=3, tags=["par"])
+    # reimportar atualiza sem duplicar nem perder o histórico
+    db.mark_seen("ana", "math", [q["id"] for q in qs])
+    db.import_questions("math", make_pool())
+    assert db.count("math") == 50
+    unseen = db.ids("math", 2, 3, ["par"], player="ana")
+    assert len(unseen) == len(db.ids("math", 2, 3, ["par"])) - 5
+    db.reset_seen("ana")
+    assert len(db.ids("math", player="ana")) == 50
+
+
+def test_sample_questions_uses_database_backend(make_pool):
+    db = QuestionDB()
+    db.import_questions("logic", make_pool())
+    questions.use_database(db)
+    try:
+        assert len(questions.load_questions("logic")) == 50
+        qs = questions.sample_questions("logic", random.Random(2), count=3, min_difficulty=4, player="bia")
+        assert len(qs) == 3
+        assert all(q["difficulty"] >= 4 and q["answer"] in q["choices"] for q in qs)
+    finally:
+        questions.use_database(None)
+    with pytest.raises(ValueError):
+        questions.sample_questions("logic", random.Random(2), tags=["par"])
+
+
+def test_load_fetches_tags_without_a_query_per_question(make_pool):
+    db = QuestionDB()
+    db.import_questions("math", make_pool())
+    db.import_questions("logic", make_pool()[:3])
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    loaded = db.load("math")
+    db.conn.set_trace_callback(None)
+    assert len(statements) == 2
+    assert [q["id"] for q in loaded] == list(range(1, 51))
+    assert all(q.get("tags") == (["par"] if q["id"] % 2 == 0 else None) for q in loaded)
+    rowids = db.ids("math", min_difficulty=3)
+    assert [q["id"] for q in db.get_many(rowids)] == [db.get(r)["id"] for r in rowids]
+    assert db.get(10_000) is None
+
+
+def test_sample_matches_sampling_the_eligible_ids(make_pool):
+    db = QuestionDB()
+    db.import_questions("math", make_pool())
+    rng_a, rng_b = random.Random(5), random.Random(5)
+    for _ in range(10):
+        qs = db.sample("math", rng_a, count=3, min_difficulty=2, tags=["par"], player="ana")
+        ids = db.ids("math", 2, None, ["par"], player="ana")
+        assert qs == [db.get(r) for r in rng_b.sample(ids, min(3, len(ids)))]
+        db.mark_seen("ana", "math", [q["id"] for q in qs])
+    assert db.sample("math", rng_a, count=3, min_difficulty=2, tags=["par"], player="ana") == []
+    db.reset_seen("ana")
+    assert len(db.sample("math", rng_a, count=3, tags=["par"], player="ana")) == 3
+    # reimportar invalida as listas em cache
+    db.import_questions("math", [dict(q, difficulty=5) for q in make_pool()])
+    assert all(q["difficulty"] == 5 for q in db.sample("math", rng_a, count=5, min_difficulty=5))
+
+
+def test_import_updates_tags_and_keeps_last_duplicate(make_pool):
+    db = QuestionDB()
+    db.import_questions("math", make_pool())
+    pool = make_pool()
+    pool[1]["tags"] = ["nova"]
+    assert db.import_questions("math", pool + [dict(pool[2], tags=["dup"])]) == 51
+    assert db.count("math") == 50
+    by_id = {q["id"]: q for q in db.load("math")}
+    assert by_id[2]["tags"] == ["nova"] and by_id[3]["tags"] == ["dup"] and by_id[4]["tags"] == ["par"]
+
+
+def test_sample_quiz_sets_uses_database_backend(make_pool):
+    db = QuestionDB()
+    db.import_questions("math", make_pool())
+    questions.use_database(db)
+    try:
+        sets = questions.sample_quiz_sets("math", random.Random(3), num_sets=4, count=3, min_difficulty=5)
+    finally:
+        questions.use_database(None)
+    # no pool do banco, dificuldade 5 são os ids com resto 4 na divisão por 5
+    assert len(sets) == 4 and all(len(qs) == 3 for qs in sets)
+    assert all(q["id"] % 5 == 4 and q["question"] == f"Pergunta ção {q['id']}?" for qs in sets for q in qs)
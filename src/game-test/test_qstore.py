@@ -0,0 +1,62 @@
+import os
+import random
+
+from game import questions
+from game.qstore import QuestionStore, write_store
+
+
+def test_store_roundtrip_is_lazy_and_complete(tmp_path, make_pool):
+    path = tmp_path / "questions_math.qbin"
+    pool = make_pool(50, tags=False)
+    write_store(path, pool)
+    by_difficulty = sorted(pool, key=lambda q: q["difficulty"])
+    with QuestionStore(path) as store:
+        assert len(store) == 50
+        # registros gravados em ordem (estável) de dificuldade
+        assert store.difficulties() == [q["difficulty"] for q in by_difficulty]
+        assert store.buckets == [(1, 0), (2, 10), (3, 20), (4, 30), (5, 40)]
+        q = store[10]
+        assert q["answer"] == str(by_difficulty[10]["id"] * 2) and q.get("missing") is None
+        assert q.copy() == by_difficulty[10]
+        assert [x["id"] for x in store[-2:]] == [44, 49]
+    assert store.closed
+
+
+def test_sample_questions_uses_binary_store(data_dir, make_pool):
+    write_store(data_dir / "questions_math.qbin", make_pool(200, tags=False))
+    qs = questions.sample_questions("math", random.Random(1), count=3, min_difficulty=3)
+    assert len(qs) == 3
+    assert all(isinstance(q, dict) and q["answer"] in q["choices"] for q in qs)
+    assert isinstance(questions._cached_index("math").items, QuestionStore)
+    assert len(questions.load_questions("math")) == 200
+
+
+def test_replaced_store_is_closed(data_dir, make_pool):
+    path = data_dir / "questions_math.qbin"
+    write_store(path, make_pool(20, tags=False))
+    old = questions._cached_index("math").items
+    write_store(path, make_pool(30, tags=False))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    new = questions._cached_index("math").items
+    assert len(new) == 30 and old.closed and not new.closed
+    # sem mapeamentos abertos, regravar o arquivo funciona também no Windows
+    questions.clear_question_cache()
+    assert new.closed
+    write_store(path, make_pool(5, tags=False))
+
+
+def test_store_index_comes_from_header_and_samples_like_dict_pool(data_dir, make_pool, monkeypatch):
+    pool = make_pool(300, tags=False)
+    write_store(data_dir / "questions_math.qbin", pool)
+
+    def no_scan(self, pos):
+        raise AssertionError("o índice não deve ler os registros")
+
+    monkeypatch.setattr(QuestionStore, "difficulty", no_scan)
+    index = questions._cached_index("math")
+    assert index.count_at_least(4) == 120 and index.count_at_least(6) == 0
+    expected = questions.PoolIndex(pool)
+    for seed in range(5):
+        got = index.sample(random.Random(seed), 7, min_difficulty=3)
+        assert [q.copy() for q in got] == expected.sample(random.Random(seed), 7, min_difficulty=3)
@@ -0,0 +1,153 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from game import questions
+from game.answers import prepare_question
+from game.questions import load_questions, sample_questions
+
+
+def test_load_questions_is_cached_until_file_changes(data_dir):
+    first = load_questions("math")
+    assert len(first) == 100
+    assert questions._cached_pool("math") is questions._cached_pool("math")
+    # alterar o arquivo invalida o cache
+    path = data_dir / "questions_math.json"
+    path.write_text(json.dumps(first[:10]), encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert len(load_questions("math")) == 10
+
+
+def test_load_questions_returns_copy():
+    pool = load_questions("logic")
+    prepare_question(pool[0])
+    pool[1]["answer"] = "alterada"
+    pool.clear()
+    fresh = load_questions("logic")
+    assert len(fresh) > 0
+    assert "answer_norm" not in fresh[0] and fresh[1]["answer"] != "alterada"
+    assert all("answer_norm" not in q for q in questions._cached_pool("logic"))
+
+
+def test_pool_index_samples_by_difficulty_reproducibly(make_pool):
+    index = questions.PoolIndex(make_pool(1000))
+    assert index.count_at_least(4) == 400
+    assert index.count_at_least(9) == 0
+    a = index.sample(random.Random(7), 20, min_difficulty=4)
+    b = index.sample(random.Random(7), 20, min_difficulty=4)
+    assert a == b
+    assert len({q["id"] for q in a}) == 20
+    assert all(q["difficulty"] >= 4 for q in a)
+    assert len(index.sample(random.Random(1), 50, min_difficulty=5)) == 50
+
+
+def test_sample_questions_respects_min_difficulty():
+    qs = sample_questions("logic", random.Random(3), count=3, min_difficulty=4)
+    assert len(qs) == 3
+    assert all(q["difficulty"] >= 4 for q in qs)
+    assert all(q["answer"] in q["choices"] for q in qs)
+
+
+def test_build_choices_vectorized_batch():
+    pytest.importorskip("numpy")
+    answers = [str(i) for i in range(500)] + ["x"]
+    a = questions.build_choices("math", answers, random.Random(4), vectorized=True)
+    assert a == questions.build_choices("math", answers, random.Random(4), vectorized=True)
+    assert all(len(c) == 3 and ans in c for ans, c in zip(answers, a))
+    assert sorted(a[-1]) == ["0", "x", "x?"]
+    assert all(0 < abs(int(d) - int(ans)) <= 5 or d == "0" for ans, c in zip(answers[:-1], a) for d in c if d != ans)
+
+
+def test_import_game_does_not_load_numpy():
+    src = Path(__file__).resolve().parents[1]
+    code = "import sys, game; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_sample_quiz_sets_for_many_rooms():
+    sets = questions.sample_quiz_sets("python", random.Random(1), num_sets=20, count=3, min_difficulty=2)
+    assert len(sets) == 20
+    assert all(len(qs) == 3 and all(q["difficulty"] >= 2 and q["answer"] in q["choices"] for q in qs) for qs in sets)
+
+
+def test_streaming_ndjson_pool(data_dir, monkeypatch):
+    path = data_dir / "stream" / "questions_math.ndjson"
+    path.parent.mkdir()
+    assert questions.write_pool_ndjson(path, questions.generate_pool("math", 5000)) == 5000
+    # sem opt-in o pool de carga (mesmo mais recente) não substitui o pool do jogo
+    assert not isinstance(questions._cached_index("math"), questions.StreamingPool)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+    assert len(load_questions("math")) == 100
+    questions.use_streaming_pools(True)
+    try:
+        assert isinstance(questions._cached_index("math"), questions.StreamingPool)
+        a = sample_questions("math", random.Random(9), count=3, min_difficulty=4)
+        assert a == sample_questions("math", random.Random(9), count=3, min_difficulty=4)
+        assert len(a) == 3 and all(q["difficulty"] >= 4 and q["answer"] in q["choices"] for q in a)
+        assert len(load_questions("math")) == 5000
+        # vários conjuntos: uma única leitura do arquivo
+        reads = []
+        real_iter_pool = questions.iter_pool
+        monkeypatch.setattr(questions, "iter_pool", lambda p: reads.append(p) or real_iter_pool(p))
+        sets = questions.sample_quiz_sets("math", random.Random(2), num_sets=25, count=3, min_difficulty=3)
+        assert len(reads) == 1
+        assert len(sets) == 25 and all(len(qs) == 3 and all(q["difficulty"] >= 3 for q in qs) for qs in sets)
+        assert all(len({q["id"] for q in qs}) == 3 for qs in sets)
+    finally:
+        questions.use_streaming_pools(False)
+    assert len(load_questions("math")) == 100
+
+
+def test_generated_pool_is_written_line_by_line(data_dir):
+    # pool grande: gravado do gerador para o arquivo, sem montar a lista
+    tracemalloc.start()
+    try:
+        questions._ensure_pool("python", total=20000)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert len((data_dir / "questions_python.ndjson").read_text(encoding="utf-8").splitlines()) == 20000
+    assert peak < 1_000_000
+    path = questions._ensure_pool("math")
+    assert path == data_dir / "questions_math.ndjson"
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 100
+    assert questions._ensure_pool("math") == path
+    assert len(load_questions("math")) == 100
+    assert list(questions.iter_theme_pool("math")) == load_questions("math")
+    # formato legado continua disponível
+    legacy = questions._ensure_pool("logic", fmt="json")
+    assert legacy.suffix == ".json" and legacy.read_text(encoding="utf-8").startswith("[\n  {")
+    assert len(load_questions("logic")) == 100
+
+
+def test_reservoir_sample_is_uniform_enough():
+    rng = random.Random(0)
+    hits = [0] * 10
+    for _ in range(2000):
+        for x in questions.reservoir_sample(iter(range(10)), rng, 3):
+            hits[x] += 1
+    assert all(500 < h < 700 for h in hits)
+    assert questions.reservoir_sample(iter(range(2)), rng, 3) == [0, 1]
+
+
+def test_reservoir_sample_many_sets_are_uniform_and_independent():
+    rng = random.Random(0)
+    hits = [0] * 50
+    sets = questions.reservoir_sample_many(iter(range(50)), rng, 5, 4000)
+    for res in sets:
+        assert len(set(res)) == 5
+        for x in res:
+            hits[x] += 1
+    # esperado: 4000 * 5 / 50 = 400 por item
+    assert all(320 < h < 480 for h in hits)
+    assert len({tuple(sorted(res)) for res in sets}) > 3000
+    assert questions.reservoir_sample_many(iter(range(2)), rng, 3, 2) == [[0, 1], [0, 1]]
@@ -0,0 +1,97 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from game.render_cache import (
+    ChunkedLayerCache,
+    MinimapCache,
+    OverlayPool,
+    TextCache,
+    TiledBackgroundCache,
+)
+
+
+def _tile():
+    tile = pygame.Surface((16, 16))
+    tile.fill((200, 200, 200))
+    tile.fill((10, 20, 30), (0, 0, 4, 4))
+    return tile
+
+
+def test_tiled_background_matches_per_tile_blits():
+    tile = _tile()
+    cache = TiledBackgroundCache()
+    for cam_x, cam_y in [(0, 0), (37, -21), (-100, 999)]:
+        expected = pygame.Surface((100, 60))
+        for x in range(cam_x - (cam_x % 16) - 16, cam_x + 100 + 16, 16):
+            for y in range(cam_y - (cam_y % 16) - 16, cam_y + 60 + 16, 16):
+                expected.blit(tile, (x - cam_x, y - cam_y))
+        got = pygame.Surface((100, 60))
+        cache.blit(got, tile, cam_x, cam_y)
+        assert pygame.image.tobytes(got, "RGB") == pygame.image.tobytes(expected, "RGB")
+    assert cache.rebuilds == 1
+
+
+def test_tiled_background_rebuilds_on_new_tile():
+    cache = TiledBackgroundCache()
+    target = pygame.Surface((32, 32))
+    cache.blit(target, _tile())
+    cache.blit(target, _tile())
+    assert cache.rebuilds == 2
+
+
+def test_chunked_layer_renders_once_and_invalidates_locally():
+    calls = []
+
+    def render(chunk, wx, wy):
+        calls.append((wx, wy))
+        chunk.fill((255, 0, 0, 255))
+        return wx >= 0
+
+    cache = ChunkedLayerCache(render, chunk_w=64, chunk_h=64)
+    target = pygame.Surface((100, 100))
+    cache.blit(target, 0, 0)
+    assert sorted(calls) == [(0, 0), (0, 64), (64, 0), (64, 64)]
+    assert target.get_at((99, 99))[:3] == (255, 0, 0)
+    cache.blit(target, 0, 0)
+    assert len(calls) == 4
+    cache.invalidate_rect(70, 10, 5, 5)
+    cache.blit(target, 0, 0)
+    assert calls[4:] == [(64, 0)]
+    # chunks vazios não guardam superfície nem são blitados
+    cache.blit(target, -64, 0)
+    assert cache._chunks[(-1, 0)] is None
+
+
+def test_text_cache_reuses_surfaces_and_bounds_size():
+    cache = TextCache(maxsize=2)
+    a = cache.render("Score: 1", color=(255, 255, 255), size=18)
+    assert cache.render("Score: 1", color=[255, 255, 255], size=18) is a
+    assert cache.render("Score: 1", color="yellow", size=18) is not a
+    cache.render("Score: 2", size=18)
+    assert len(cache) == 2 and cache.misses == 3
+
+
+def test_minimap_cache_stamps_until_bounds_grow():
+    mm = MinimapCache(100, 100)
+    assert mm.include_rect(0, 0, 1000, 1000)
+    mm.rebuild()
+    assert not mm.dirty and mm.scale == pytest.approx(0.1)
+    # dentro dos limites: apenas carimba
+    assert not mm.include_rect(100, 100, 200, 200)
+    mm.stamp_rect(100, 100, 200, 200, (100, 100, 140))
+    assert mm.surface.get_at((mm.pad + 15, mm.pad + 15))[:3] == (100, 100, 140)
+    # limites maiores mudam a escala e exigem rebuild
+    assert mm.include_rect(1500, 0, 500, 500)
+    assert mm.dirty
+    mm.rebuild()
+    assert mm.rebuilds == 2 and mm.to_minimap(2000, 0) == (100, 0)
+
+
+def test_overlay_pool_returns_same_surface():
+    pool = OverlayPool()
+    pool.prebuild([((10, 5), (1, 2, 3, 128))])
+    s = pool.get((10, 5), (1, 2, 3, 128))
+    assert pool.get([10, 5], [1, 2, 3, 128]) is s
+    assert s.get_at((0, 0)) == (1, 2, 3, 128)
+    assert len(pool) == 1
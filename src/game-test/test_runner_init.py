@@ -0,0 +1,55 @@
+import contextlib
+import importlib
+import io
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pytest.importorskip("pygame")
+pytest.importorskip("pgzero")
+
+# (salas, livros, guardiões) após init_game() com random.seed(seed), medidos
+# no runner original, que testava a geometria sala x entidade diretamente
+BASELINE_COUNTS = [
+    (6, 5, 5), (5, 5, 5), (6, 5, 5), (6, 4, 6), (5, 5, 5), (5, 4, 5),
+    (7, 6, 6), (5, 5, 4), (6, 4, 6), (6, 6, 6), (7, 5, 7), (6, 4, 5),
+    (5, 5, 5), (7, 6, 6), (5, 4, 5), (6, 4, 4), (6, 4, 5), (6, 4, 5),
+    (6, 5, 6), (6, 5, 6), (6, 6, 6), (5, 4, 4), (6, 6, 5), (6, 3, 5),
+    (6, 5, 6), (7, 4, 5), (8, 5, 7), (6, 6, 6), (6, 6, 6), (6, 6, 6),
+    (7, 6, 6), (6, 6, 6), (7, 5, 6), (6, 5, 6), (5, 4, 5), (6, 5, 6),
+    (6, 5, 5), (5, 4, 5), (7, 5, 5), (6, 6, 6), (5, 5, 5), (6, 6, 5),
+    (7, 6, 6), (5, 5, 5), (7, 6, 6), (8, 6, 7), (5, 4, 5), (6, 6, 6),
+    (8, 5, 7), (7, 4, 6), (6, 5, 5), (7, 5, 6), (4, 4, 4), (5, 3, 5),
+    (7, 5, 6), (5, 4, 5), (6, 5, 6), (7, 6, 6), (6, 5, 5), (6, 5, 5),
+]
+
+
+@pytest.fixture(scope="module")
+def runner():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importlib.import_module("game.run_game_pgzero")
+
+
+def _init(runner, seed):
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner.init_game()
+
+
+def test_init_game_entity_counts_match_baseline(runner):
+    got = []
+    for seed in range(len(BASELINE_COUNTS)):
+        _init(runner, seed)
+        got.append((len(runner.rooms), len(runner.books), len(runner.guardians)))
+    assert got == BASELINE_COUNTS
+
+
+def test_overlapping_entities_are_listed_in_room_contents(runner):
+    for seed in range(len(BASELINE_COUNTS)):
+        _init(runner, seed)
+        for r in runner.rooms:
+            contents = runner.room_contents[r["id"]]
+            assert contents["books"] and contents["guardians"]
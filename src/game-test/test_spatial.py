@@ -0,0 +1,40 @@
+from game.spatial import SpatialGrid
+
+
+def test_query_rect_matches_brute_force():
+    grid = SpatialGrid(100, 80)
+    rects = [(i * 37 % 500, i * 53 % 400, 20 + i % 30, 15 + i % 25) for i in range(60)]
+    items = [{"id": i} for i in range(len(rects))]
+    for item, r in zip(items, rects):
+        grid.insert(item, *r)
+    qx, qy, qw, qh = 120, 90, 150, 110
+    expected = [
+        item for item, (x, y, w, h) in zip(items, rects)
+        if x < qx + qw and qx < x + w and y < qy + qh and qy < y + h
+    ]
+    assert grid.query_rect(qx, qy, qw, qh) == expected
+
+
+def test_query_point_and_nearby():
+    grid = SpatialGrid(320, 240, 40, 60)
+    a, b = {"n": "a"}, {"n": "b"}
+    grid.insert(a, 100, 100, 50, 50)
+    grid.insert(b, 400, 300, 50, 50)
+    assert grid.query_point(120, 120) == [a]
+    # limite direito é aberto, como em pygame.Rect.collidepoint
+    assert grid.query_point(150, 120) == []
+    assert grid.query_point(150, 120, inclusive=True) == [a]
+    assert grid.nearby(160, 160, 24) == [a]
+    assert grid.any_in_rect(390, 290, 20, 20)
+
+
+def test_remove_and_clear():
+    grid = SpatialGrid(64, 64)
+    a = {"n": "a"}
+    grid.insert(a, 0, 0, 200, 200)
+    assert a in grid and len(grid) == 1
+    assert grid.remove(a)
+    assert grid.query_rect(0, 0, 300, 300) == []
+    grid.insert(a, 0, 0, 10, 10)
+    grid.clear()
+    assert len(grid) == 0
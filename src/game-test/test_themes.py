@@ -0,0 +1,33 @@
+import random
+import sys
+
+from game import questions, themes
+
+
+def test_builtin_themes_keep_map_order():
+    assert themes.THEME_NAMES[:3] == ["math", "logic", "python"]
+    assert questions.THEMES is themes.THEME_NAMES
+
+
+def test_registered_theme_is_imported_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "theme_colors.py").write_text(
+        "def make_question(i):\n"
+        "    return f'Cor {i}?', 'azul', ''\n"
+        "def distractors(correct, rng):\n"
+        "    return ['verde', 'vermelho']\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(questions, "DATA_DIR", tmp_path)
+    questions.clear_question_cache()
+    themes.register_theme("colors", "theme_colors")
+    try:
+        assert "theme_colors" not in sys.modules
+        qs = questions.sample_questions("colors", random.Random(1), count=3)
+        assert "theme_colors" in sys.modules
+        assert all(sorted(q["choices"]) == ["azul", "verde", "vermelho"] for q in qs)
+    finally:
+        themes.unregister_theme("colors")
+        sys.modules.pop("theme_colors", None)
+        questions.clear_question_cache()
+    assert "colors" not in themes.THEME_NAMES
@@ -0,0 +1,149 @@
+"""Movimento em lote para muitos agentes (bots, NPCs em patrulha, simulações).
+
+`AgentStore` guarda posições, velocidades e `speed` de todos os agentes em
+arrays NumPy; `step(dt)` integra todos de uma vez e `apply_inputs()` faz o
+equivalente a `compute_direction()` para um vetor de teclas. Para código que
+trabalha com um único jogador, `store.player(i)` devolve uma view que é um
+`Player` (com `pos` sendo um `Vector2`) lendo e escrevendo nos arrays.
+
+O NumPy é opcional no pacote; só este módulo o exige.
+"""
+from .entities import Player, Vector2
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - NumPy é opcional
+    np = None
+
+
+class AgentStore:
+    """Posições e velocidades de N agentes em arrays (N, 2)."""
+
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("AgentStore requer NumPy")
+        capacity = max(1, capacity)
+        self._pos = np.zeros((capacity, 2))
+        self._vel = np.zeros((capacity, 2))
+        self._speed = np.zeros(capacity)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    # views sobre os agentes ativos (não copiam)
+    @property
+    def pos(self):
+        return self._pos[:self._n]
+
+    @property
+    def vel(self):
+        return self._vel[:self._n]
+
+    @property
+    def speed(self):
+        return self._speed[:self._n]
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * len(self._speed))
+        for name in ("_pos", "_vel", "_speed"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:])
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def add(self, x: float, y: float, speed: float = 200.0) -> int:
+        """Acrescenta um agente parado; devolve seu índice."""
+        i = self._n
+        if i >= len(self._speed):
+            self._grow(i + 1)
+        self._pos[i] = (x, y)
+        self._vel[i] = 0.0
+        self._speed[i] = speed
+        self._n += 1
+        return i
+
+    def add_many(self, positions, speed=200.0):
+        """Acrescenta vários agentes de uma vez; devolve o intervalo de índices."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        start, end = self._n, self._n + len(positions)
+        if end > len(self._speed):
+            self._grow(end)
+        self._pos[start:end] = positions
+        self._vel[start:end] = 0.0
+        self._speed[start:end] = speed
+        self._n = end
+        return range(start, end)
+
+    def set_directions(self, directions):
+        """Velocidade = direção (dx, dy) * speed, como em `Player.move()`."""
+        self.vel[:] = np.asarray(directions, dtype=float).reshape(-1, 2) * self.speed[:, None]
+
+    def apply_inputs(self, left, right, up, down):
+        """`compute_direction()` em lote: um booleano por agente para cada tecla."""
+        directions = np.empty((self._n, 2))
+        directions[:, 0] = np.asarray(right, dtype=float) - np.asarray(left, dtype=float)
+        directions[:, 1] = np.asarray(down, dtype=float) - np.asarray(up, dtype=float)
+        self.set_directions(directions)
+
+    def step(self, dt: float):
+        """Integra todos os agentes por `dt` segundos."""
+        n = self._n
+        self._pos[:n] += self._vel[:n] * dt
+
+    def player(self, i: int) -> "PlayerView":
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return PlayerView(self, i)
+
+
+class Vector2View(Vector2):
+    """`Vector2` cuja posição mora na linha `i` de `AgentStore.pos`."""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: AgentStore, i: int):
+        self._store = store
+        self._i = i
+
+    @property
+    def x(self):
+        return float(self._store._pos[self._i, 0])
+
+    @x.setter
+    def x(self, value):
+        self._store._pos[self._i, 0] = value
+
+    @property
+    def y(self):
+        return float(self._store._pos[self._i, 1])
+
+    @y.setter
+    def y(self, value):
+        self._store._pos[self._i, 1] = value
+
+
+class PlayerView(Player):
+    """`Player` apoiado num `AgentStore`; `move()` escreve direto nos arrays."""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: AgentStore, i: int):
+        self._store = store
+        self._i = i
+
+    @property
+    def pos(self):
+        return Vector2View(self._store, self._i)
+
+    @pos.setter
+    def pos(self, value):
+        self._store._pos[self._i] = (value.x, value.y)
+
+    @property
+    def speed(self):
+        return float(self._store._speed[self._i])
+
+    @speed.setter
+    def speed(self, value):
+        self._store._speed[self._i] = value
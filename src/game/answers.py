@@ -0,0 +1,58 @@
+"""Verificação de respostas compartilhada por todos os modos de jogo.
+
+A normalização (`str(x).strip().lower()`) é feita uma vez por pergunta, ao
+amostrar ou carregar: `prepare_question()` guarda a resposta normalizada em
+`answer_norm`, uma tupla `choice_correct` (uma flag por alternativa) e o
+`correct_index` da primeira alternativa correta. Corrigir uma escolha vira
+então um acesso por índice; perguntas não preparadas continuam funcionando,
+só que normalizando na hora.
+"""
+from typing import Dict, List, Optional
+
+
+def normalize_answer(value) -> str:
+    return str(value).strip().lower()
+
+
+def prepare_question(q: Dict) -> Dict:
+    """Acrescenta (no próprio dict) os campos pré-calculados; devolve `q`."""
+    norm = normalize_answer(q.get("answer"))
+    q["answer_norm"] = norm
+    flags = tuple(normalize_answer(c) == norm for c in q.get("choices") or ())
+    q["choice_correct"] = flags
+    q["correct_index"] = flags.index(True) if True in flags else None
+    return q
+
+
+def prepare_questions(questions: List[Dict]) -> List[Dict]:
+    for q in questions:
+        if "choice_correct" not in q:
+            prepare_question(q)
+    return questions
+
+
+def correct_index(q: Dict) -> Optional[int]:
+    """Índice da primeira alternativa correta (ou None)."""
+    if "choice_correct" not in q:
+        prepare_question(q)
+    return q["correct_index"]
+
+
+def is_choice_correct(q: Dict, index) -> bool:
+    """True se a alternativa `index` de `q["choices"]` é uma resposta correta."""
+    flags = q.get("choice_correct")
+    if flags is None:
+        flags = prepare_question(q)["choice_correct"]
+    try:
+        i = int(index)
+    except (TypeError, ValueError):
+        return False
+    return 0 <= i < len(flags) and flags[i]
+
+
+def is_answer_correct(q: Dict, text) -> bool:
+    """Compara uma resposta digitada com a resposta da pergunta."""
+    norm = q.get("answer_norm")
+    if norm is None:
+        norm = normalize_answer(q.get("answer"))
+    return normalize_answer(text) == norm
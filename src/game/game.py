@@ -9,7 +9,9 @@ module API para desenvolvimento posterior.
 from .settings import WIDTH, HEIGHT, DEFAULT_SEED, DEFAULT_NUM_ROOMS
 
 from .ui import MENU, DESCRIPTION, format_menu
-from .mapgen import generate_map
+from .mapcache import get_map
+from .mapgen import CompactMapDescriptor
+from dataclasses import replace
 from .room import Room
 from .questions import sample_questions
 import random
@@ -24,6 +26,76 @@ class GameState:
         self.current_room = None
         self.player_score = 0
         self.rng = random.Random(self.seed)
+        # id da sala -> posição em map.rooms (None: ids densos, id == posição);
+        # refeito se o mapa for trocado ou crescer por fora de add_room()
+        self._room_rows = None
+        self._indexed_map = None
+        self._indexed_len = 0
+        self._owns_map = False
+
+    def _map_ids(self):
+        if isinstance(self.map, CompactMapDescriptor):
+            return self.map.ids
+        return [r.id for r in self.map.rooms]
+
+    def _room_index(self):
+        n = len(self.map.rooms)
+        if self.map is not self._indexed_map or n != self._indexed_len:
+            if self.map is not self._indexed_map:
+                self._owns_map = False
+            ids = self._map_ids()
+            if all(rid == pos for pos, rid in enumerate(ids)):
+                rows = None
+            else:
+                rows = {}
+                for pos, rid in enumerate(ids):
+                    # ids repetidos: vale o primeiro, como na busca linear
+                    rows.setdefault(rid, pos)
+            self._room_rows = rows
+            self._indexed_map = self.map
+            self._indexed_len = n
+        return self._room_rows
+
+    def _room_row(self, room_id):
+        rows = self._room_index()
+        if rows is None:
+            return room_id if isinstance(room_id, int) and 0 <= room_id < self._indexed_len else None
+        return rows.get(room_id)
+
+    def room_by_id(self, room_id: int):
+        """Descritor da sala com esse id (ou None), em O(1)."""
+        if self.map is None:
+            return None
+        pos = self._room_row(room_id)
+        # em mapas compactos a view é criada só aqui
+        return None if pos is None else self.map.rooms[pos]
+
+    def add_room(self, desc):
+        """Acrescenta uma sala ao mapa atual mantendo o índice por id."""
+        self._room_index()
+        if not self._owns_map:
+            # o mapa pode vir do cache compartilhado de get_map(): copiar antes de alterar
+            if isinstance(self.map, CompactMapDescriptor):
+                self.map = self.map.copy()
+            else:
+                self.map = replace(self.map, rooms=list(self.map.rooms))
+            self._owns_map = True
+        pos = len(self.map.rooms)
+        if isinstance(self.map, CompactMapDescriptor):
+            self.map.append(desc.id, desc.required_score, desc.theme, desc.x, desc.y, desc.w, desc.h,
+                            desc.name, desc.owner_npc)
+            desc = self.map.rooms[pos]
+        else:
+            self.map.rooms.append(desc)
+        rows = self._room_rows
+        if rows is None and desc.id != pos:
+            # deixou de ser denso: passa a guardar as posições explicitamente
+            rows = self._room_rows = {rid: rid for rid in range(pos)}
+        if rows is not None:
+            rows.setdefault(desc.id, pos)
+        self._indexed_map = self.map
+        self._indexed_len = pos + 1
+        return desc
 
     def start_game(self, seed: int = None, num_rooms: int = None):
         # usa seed padrão de settings se não informado
@@ -31,12 +103,13 @@ class GameState:
             self.seed = seed
         if num_rooms is None:
             num_rooms = DEFAULT_NUM_ROOMS
-        self.map = generate_map(self.seed, num_rooms=num_rooms)
+        self.map = get_map(self.seed, num_rooms=num_rooms)
+        self._room_index()
         self.mode = "playing"
         self.player_score = 0
 
     def goto_room(self, room_id: int):
-        desc = next((r for r in self.map.rooms if r.id == room_id), None)
+        desc = self.room_by_id(room_id)
         if desc is None:
             raise ValueError("Sala desconhecida")
         self.current_room = Room(desc)
@@ -58,7 +131,7 @@ def enter_room(room_id: int):
     """Tenta entrar em uma sala: retorna (can_enter, info)"""
     if _GS.map is None:
         return False, None
-    desc = next((r for r in _GS.map.rooms if r.id == room_id), None)
+    desc = _GS.room_by_id(room_id)
     if desc is None:
         return False, None
     can = _GS.player_score >= desc.required_score
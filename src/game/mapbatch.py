@@ -0,0 +1,125 @@
+"""Geração de mapas em lote, distribuída num pool de processos.
+
+`generate_maps()` reparte as seeds em blocos (`chunk_size`) e os envia a um
+`ProcessPoolExecutor`, mantendo no máximo alguns blocos em andamento. Cada
+processo devolve os mapas já codificados em bytes (`mapcache.encode_map`),
+bem menores de serializar que listas de dataclasses, e os resultados saem na
+ordem das seeds assim que o bloco correspondente termina.
+
+Linha de comando (um resumo NDJSON por seed na saída padrão):
+
+    python -m game.mapbatch --seeds 0:10000 --rooms 30 --workers 8
+    python -m game.mapbatch --seeds 0:10000 --output mapas.bin
+
+Com `--output`, os mapas completos são gravados em sequência, cada um
+prefixado pelo tamanho (u32); `read_maps()` lê esse arquivo em streaming.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+from .mapcache import decode_map, encode_map
+from .mapgen import MapDescriptor, generate_map
+from .settings import WIDTH, HEIGHT
+from .themes import THEME_NAMES
+
+SIZE = struct.Struct("<I")
+
+
+def _generate_chunk(seeds, num_rooms, width, height, themes):
+    return [encode_map(generate_map(s, num_rooms, width, height, themes)) for s in seeds]
+
+
+def _chunks(seeds: Iterable[int], size: int):
+    chunk = []
+    for s in seeds:
+        chunk.append(s)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_maps(seeds: Iterable[int], num_rooms: int = 10, width: int = WIDTH, height: int = HEIGHT,
+                  workers: int = None, chunk_size: int = 64) -> Iterator[MapDescriptor]:
+    """Gera um mapa por seed, em paralelo, devolvendo-os na ordem das seeds.
+
+    `workers=1` gera no próprio processo. No máximo `2 * workers` blocos ficam
+    pendentes, então `seeds` pode ser um iterável longo (ou preguiçoso).
+    """
+    workers = workers or os.cpu_count() or 1
+    # os processos recebem os temas explicitamente: temas registrados em
+    # tempo de execução não existem num processo iniciado com spawn
+    themes = tuple(THEME_NAMES)
+    if workers == 1:
+        for s in seeds:
+            yield generate_map(s, num_rooms, width, height, themes)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(seeds, chunk_size):
+            pending.append(pool.submit(_generate_chunk, chunk, num_rooms, width, height, themes))
+            if len(pending) >= 2 * workers:
+                for data in pending.popleft().result():
+                    yield decode_map(data)
+        while pending:
+            for data in pending.popleft().result():
+                yield decode_map(data)
+
+
+def write_maps(f, maps: Iterable[MapDescriptor]) -> int:
+    n = 0
+    for m in maps:
+        data = encode_map(m)
+        f.write(SIZE.pack(len(data)))
+        f.write(data)
+        n += 1
+    return n
+
+
+def read_maps(path) -> Iterator[MapDescriptor]:
+    with open(path, "rb") as f:
+        while True:
+            head = f.read(SIZE.size)
+            if len(head) < SIZE.size:
+                return
+            yield decode_map(f.read(SIZE.unpack(head)[0]))
+
+
+def _parse_seeds(spec: str):
+    if ":" in spec:
+        start, stop = spec.split(":", 1)
+        return range(int(start), int(stop))
+    return [int(s) for s in spec.split(",") if s.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera mapas para muitas seeds em paralelo.")
+    parser.add_argument("--seeds", default="0:1000", help="intervalo início:fim ou lista separada por vírgulas")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--output", help="grava os mapas completos neste arquivo")
+    args = parser.parse_args(argv)
+
+    maps = generate_maps(_parse_seeds(args.seeds), args.rooms, workers=args.workers, chunk_size=args.chunk_size)
+    out = open(args.output, "wb") if args.output else None
+    try:
+        for m in maps:
+            if out is not None:
+                write_maps(out, [m])
+            print(json.dumps({"seed": m.seed, "rooms": len(m.rooms), "overlap_fallbacks": m.overlap_fallbacks}))
+    finally:
+        if out is not None:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Cache de mapas gerados, chaveado pela seed.
+
+`generate_map()` é uma função pura de (seed, num_rooms, largura, altura), da
+versão do gerador e da lista de temas registrados; essa é a chave. `get_map()`
+guarda os mapas num LRU em processo e, se configurado com `cache_dir`,
+também em disco num formato binário compacto, para que reinícios e sessões
+repetidas com seeds populares não gerem o mapa de novo.
+
+Os mapas devolvidos são compartilhados: trate-os como somente leitura.
+
+Formato `.map` (little-endian): cabeçalho com magic `MAP2`, seed, número de
+salas pedidas e geradas, `overlap_fallbacks` e flags; a contagem de temas;
+um registro de largura fixa por sala (id, pontuação exigida, x, y, w, h,
+índice do tema); e, por fim, os nomes dos temas seguidos de nomes e donos
+das salas em UTF-8 separados por `\\0`. Nomes no padrão do gerador
+("Sala N", "Guardiao_N") não são gravados (flag `DEFAULT_NAMES`).
+"""
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from .mapgen import GENERATOR_VERSION, MapDescriptor, RoomDescriptor, generate_map
+from .settings import WIDTH, HEIGHT
+from .themes import THEME_NAMES
+
+MAGIC = b"MAP2"
+HEADER = struct.Struct("<4sqIIIB")
+# flag: nomes e donos seguem o padrão do gerador e não foram gravados
+DEFAULT_NAMES = 1
+ROOM = struct.Struct("<iiiiiiH")
+
+
+def _default_names(rid: int):
+    return f"Sala {rid + 1}", f"Guardiao_{rid + 1}"
+
+
+def encode_map(m: MapDescriptor) -> bytes:
+    themes = sorted({r.theme for r in m.rooms})
+    theme_ids = {t: i for i, t in enumerate(themes)}
+    names = [s for r in m.rooms for s in (r.name, r.owner_npc)]
+    default = all((r.name, r.owner_npc) == _default_names(r.id) for r in m.rooms)
+    parts = [HEADER.pack(MAGIC, m.seed, m.num_rooms, len(m.rooms), m.overlap_fallbacks,
+                         DEFAULT_NAMES if default else 0)]
+    parts.append(struct.pack("<H", len(themes)))
+    for r in m.rooms:
+        parts.append(ROOM.pack(r.id, r.required_score, r.x, r.y, r.w, r.h, theme_ids[r.theme]))
+    strings = themes if default else themes + names
+    parts.append("\0".join(strings).encode("utf-8"))
+    return b"".join(parts)
+
+
+def decode_map(data: bytes) -> MapDescriptor:
+    magic, seed, num_rooms, count, fallbacks, flags = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo de mapa inválido")
+    (num_themes,) = struct.unpack_from("<H", data, HEADER.size)
+    start = HEADER.size + 2
+    blob_start = start + count * ROOM.size
+    strings = data[blob_start:].decode("utf-8").split("\0") if blob_start < len(data) else []
+    themes, names = strings[:num_themes], strings[num_themes:]
+    rooms = []
+    for i, (rid, required, x, y, w, h, theme) in enumerate(ROOM.iter_unpack(data[start:blob_start])):
+        name, owner = _default_names(rid) if flags & DEFAULT_NAMES else names[2 * i:2 * i + 2]
+        rooms.append(RoomDescriptor(id=rid, name=name, required_score=required, owner_npc=owner,
+                                    theme=themes[theme], x=x, y=y, w=w, h=h))
+    return MapDescriptor(seed=seed, num_rooms=num_rooms, rooms=rooms, overlap_fallbacks=fallbacks)
+
+
+class MapCache:
+    """LRU de mapas em processo, com persistência opcional em `cache_dir`."""
+
+    def __init__(self, maxsize: int = 32, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._maps = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._maps)
+
+    def clear(self):
+        self._maps.clear()
+
+    @staticmethod
+    def key(seed: int, num_rooms: int, width: int = WIDTH, height: int = HEIGHT):
+        return (seed, num_rooms, width, height, GENERATOR_VERSION, tuple(THEME_NAMES))
+
+    def _path(self, key) -> Path:
+        # só o cache em disco precisa do hashlib: fora do import de `game`
+        import hashlib
+
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"map_{key[0]}_{key[1]}_{digest}.map"
+
+    def _load(self, key) -> Optional[MapDescriptor]:
+        try:
+            data = self._path(key).read_bytes()
+            m = decode_map(data)
+        except (OSError, ValueError, struct.error, UnicodeDecodeError, IndexError):
+            return None
+        if (m.seed, m.num_rooms) != key[:2]:
+            return None
+        return m
+
+    def _store(self, key, m: MapDescriptor):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(encode_map(m))
+            tmp.replace(path)
+        except (OSError, struct.error):
+            pass  # o cache em disco é só uma otimização
+
+    def get(self, seed: int, num_rooms: int, width: int = WIDTH, height: int = HEIGHT) -> MapDescriptor:
+        key = self.key(seed, num_rooms, width, height)
+        m = self._maps.get(key)
+        if m is not None:
+            self._maps.move_to_end(key)
+            self.hits += 1
+            return m
+        m = self._load(key) if self.cache_dir is not None else None
+        if m is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            m = generate_map(seed, num_rooms=num_rooms, width=width, height=height)
+            if self.cache_dir is not None:
+                self._store(key, m)
+        self._maps[key] = m
+        while len(self._maps) > self.maxsize:
+            self._maps.popitem(last=False)
+        return m
+
+
+_CACHE = MapCache()
+
+
+def configure_map_cache(maxsize: int = 32, cache_dir=None) -> MapCache:
+    """Troca o cache padrão (ex.: para ativar a persistência em disco)."""
+    global _CACHE
+    _CACHE = MapCache(maxsize=maxsize, cache_dir=cache_dir)
+    return _CACHE
+
+
+def get_map(seed: int, num_rooms: int = 10) -> MapDescriptor:
+    """Mesmo resultado de `generate_map(seed, num_rooms)`, vindo do cache quando possível."""
+    return _CACHE.get(seed, num_rooms)
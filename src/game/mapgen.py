@@ -1,11 +1,24 @@
 """Gerador procedural simples de mapas com salas e corredores.
 
 Usa uma seed para gerar reproducibilidade. Cada mapa tem `num_rooms` salas.
+
+Com muitas salas já posicionadas, as tentativas de posicionamento consultam
+uma grade de ocupação (`SpatialGrid`) em vez de comparar com todas elas; a
+sequência de sorteios é a mesma de antes, então cada seed gera o mesmo mapa.
+Salas sem espaço livre após 200 tentativas são sobrepostas e contadas em
+`MapDescriptor.overlap_fallbacks`.
+
+Para mapas muito grandes, `generate_compact_map()` devolve o mesmo mapa em
+colunas (`CompactMapDescriptor`), com uma fração da memória.
 """
-from dataclasses import dataclass
+from array import array
+from collections.abc import Sequence
+from dataclasses import astuple, dataclass
 from typing import List
 import random
 from .settings import WIDTH, HEIGHT
+from .spatial import SpatialGrid
+from .themes import THEME_NAMES
 
 
 @dataclass
@@ -26,40 +39,231 @@ class MapDescriptor:
     seed: int
     num_rooms: int
     rooms: List[RoomDescriptor]
+    # salas que não acharam espaço livre e foram sobrepostas
+    overlap_fallbacks: int = 0
+
+
+# incremente ao mudar o algoritmo: invalida mapas guardados por `mapcache`
+GENERATOR_VERSION = 1
+
+# até quantas salas posicionadas a varredura linear ainda é mais barata que a grade
+LINEAR_SCAN_LIMIT = 48
+
 
+def _place_rooms(seed: int, num_rooms: int, width: int, height: int, themes, add_room) -> int:
+    """Posiciona as salas chamando `add_room(i, required, theme, x, y, w, h)`.
 
-def generate_map(seed: int, num_rooms: int = 10) -> MapDescriptor:
+    Devolve quantas salas caíram no posicionamento sobreposto.
+    """
     rng = random.Random(seed)
-    rooms = []
+    themes = THEME_NAMES if themes is None else list(themes)
+    randint = rng.randint
     # room sizes
     min_w, max_w = 80, 160
     min_h, max_h = 60, 140
-    attempts = 0
+    # salas já posicionadas: lista para poucas salas, grade de ocupação a
+    # partir de LINEAR_SCAN_LIMIT. Encostar também conta como sobreposição,
+    # por isso na grade os retângulos ganham +1 em cada eixo
     placed = []
+    occupied = SpatialGrid(max_w, max_h)
+    fallbacks = 0
     for i in range(num_rooms):
         required = int((i / max(1, num_rooms - 1)) * 100)
-        theme = rng.choice(["math", "logic", "python"])
+        theme = rng.choice(themes)
         # try to place without overlap
         for _ in range(200):
-            w = rng.randint(min_w, max_w)
-            h = rng.randint(min_h, max_h)
-            x = rng.randint(10, max(10, WIDTH - w - 10))
-            y = rng.randint(10, max(10, HEIGHT - h - 10))
-            rect = (x, y, w, h)
-            ok = True
-            for ox, oy, ow, oh in placed:
-                if not (x + w < ox or ox + ow < x or y + h < oy or oy + oh < y):
-                    ok = False
-                    break
+            w = randint(min_w, max_w)
+            h = randint(min_h, max_h)
+            x = randint(10, max(10, width - w - 10))
+            y = randint(10, max(10, height - h - 10))
+            if len(placed) < LINEAR_SCAN_LIMIT:
+                ok = True
+                for ox, oy, ow, oh in placed:
+                    if not (x + w < ox or ox + ow < x or y + h < oy or oy + oh < y):
+                        ok = False
+                        break
+            else:
+                ok = not occupied.any_in_rect(x, y, w + 1, h + 1)
             if ok:
-                placed.append(rect)
-                rooms.append(RoomDescriptor(id=i, name=f"Sala {i+1}", required_score=required, owner_npc=f"Guardiao_{i+1}", theme=theme, x=x, y=y, w=w, h=h))
+                placed.append((x, y, w, h))
+                occupied.insert(placed[-1], x, y, w + 1, h + 1)
+                add_room(i, required, theme, x, y, w, h)
                 break
         else:
             # fallback: place overlapping
-            w = rng.randint(min_w, max_w)
-            h = rng.randint(min_h, max_h)
-            x = rng.randint(10, max(10, WIDTH - w - 10))
-            y = rng.randint(10, max(10, HEIGHT - h - 10))
-            rooms.append(RoomDescriptor(id=i, name=f"Sala {i+1}", required_score=required, owner_npc=f"Guardiao_{i+1}", theme=theme, x=x, y=y, w=w, h=h))
-    return MapDescriptor(seed=seed, num_rooms=num_rooms, rooms=rooms)
+            fallbacks += 1
+            w = randint(min_w, max_w)
+            h = randint(min_h, max_h)
+            x = randint(10, max(10, width - w - 10))
+            y = randint(10, max(10, height - h - 10))
+            add_room(i, required, theme, x, y, w, h)
+    return fallbacks
+
+
+def generate_map(seed: int, num_rooms: int = 10, width: int = WIDTH, height: int = HEIGHT,
+                 themes=None) -> MapDescriptor:
+    rooms = []
+
+    def add_room(i, required, theme, x, y, w, h):
+        rooms.append(RoomDescriptor(id=i, name=f"Sala {i+1}", required_score=required, owner_npc=f"Guardiao_{i+1}", theme=theme, x=x, y=y, w=w, h=h))
+
+    fallbacks = _place_rooms(seed, num_rooms, width, height, themes, add_room)
+    return MapDescriptor(seed=seed, num_rooms=num_rooms, rooms=rooms, overlap_fallbacks=fallbacks)
+
+
+def generate_compact_map(seed: int, num_rooms: int = 10, width: int = WIDTH, height: int = HEIGHT,
+                         themes=None) -> "CompactMapDescriptor":
+    """Mesmo mapa de `generate_map()`, montado direto em colunas (sem dataclasses)."""
+    m = CompactMapDescriptor(seed, num_rooms)
+    m.overlap_fallbacks = _place_rooms(seed, num_rooms, width, height, themes, m.append)
+    return m
+
+
+class RoomLocator:
+    """Localização de ponto sobre as salas de um mapa (grade uniforme).
+
+    Devolve a mesma sala que percorrer `rooms` e pegar a primeira que contém
+    o ponto com bordas inclusivas; salas sobrepostas pelo fallback de
+    `generate_map()` continuam resolvidas pela ordem da lista.
+    """
+
+    def __init__(self, rooms, cell_w: int = 160, cell_h: int = 140):
+        self.grid = SpatialGrid(cell_w, cell_h)
+        for r in rooms:
+            self.grid.insert(r, r.x, r.y, r.w, r.h)
+
+    def room_at(self, x, y):
+        hits = self.grid.query_point(x, y, inclusive=True)
+        return hits[0] if hits else None
+
+
+class RoomView:
+    """Sala de um `CompactMapDescriptor`, com a mesma interface de `RoomDescriptor`."""
+
+    __slots__ = ("_map", "_i")
+
+    def __init__(self, m, i):
+        self._map = m
+        self._i = i
+
+    id = property(lambda self: self._map.ids[self._i])
+    required_score = property(lambda self: self._map.required_scores[self._i])
+    theme = property(lambda self: self._map.themes[self._map.theme_codes[self._i]])
+    x = property(lambda self: self._map.xs[self._i])
+    y = property(lambda self: self._map.ys[self._i])
+    w = property(lambda self: self._map.ws[self._i])
+    h = property(lambda self: self._map.hs[self._i])
+
+    @property
+    def name(self):
+        return self._map.names.get(self._i) or f"Sala {self.id + 1}"
+
+    @property
+    def owner_npc(self):
+        return self._map.owners.get(self._i) or f"Guardiao_{self.id + 1}"
+
+    def to_descriptor(self) -> RoomDescriptor:
+        return RoomDescriptor(id=self.id, name=self.name, required_score=self.required_score,
+                              owner_npc=self.owner_npc, theme=self.theme, x=self.x, y=self.y, w=self.w, h=self.h)
+
+    def __eq__(self, other):
+        if isinstance(other, (RoomView, RoomDescriptor)):
+            return astuple(self.to_descriptor()) == astuple(
+                other.to_descriptor() if isinstance(other, RoomView) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"RoomView({self.to_descriptor()!r})"
+
+
+class CompactRooms(Sequence):
+    """Sequência de `RoomView` sobre as colunas do mapa; as views são criadas sob demanda."""
+
+    __slots__ = ("_map",)
+
+    def __init__(self, m):
+        self._map = m
+
+    def __len__(self):
+        return len(self._map.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [RoomView(self._map, j) for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return RoomView(self._map, i)
+
+
+class CompactMapDescriptor:
+    """Variante de `MapDescriptor` em colunas (`array('i')`), para mapas grandes.
+
+    Cada sala ocupa ~25 bytes (contra centenas de bytes de um
+    `RoomDescriptor` com duas strings). `rooms` devolve views com a mesma
+    interface, então `GameState`, `enter_room()` e a colisão do `pgz_game`
+    funcionam sem mudanças. Nomes fora do padrão ficam em dicts esparsos.
+    """
+
+    __slots__ = ("seed", "num_rooms", "overlap_fallbacks", "ids", "required_scores", "theme_codes",
+                 "xs", "ys", "ws", "hs", "themes", "_theme_index", "names", "owners", "rooms")
+
+    def __init__(self, seed: int, num_rooms: int, overlap_fallbacks: int = 0):
+        self.seed = seed
+        self.num_rooms = num_rooms
+        self.overlap_fallbacks = overlap_fallbacks
+        self.ids = array("i")
+        self.required_scores = array("i")
+        self.theme_codes = array("B")
+        self.xs = array("i")
+        self.ys = array("i")
+        self.ws = array("i")
+        self.hs = array("i")
+        self.themes = []
+        self._theme_index = {}
+        self.names = {}
+        self.owners = {}
+        self.rooms = CompactRooms(self)
+
+    def append(self, rid, required, theme, x, y, w, h, name=None, owner_npc=None):
+        code = self._theme_index.get(theme)
+        if code is None:
+            code = self._theme_index[theme] = len(self.themes)
+            self.themes.append(theme)
+        pos = len(self.ids)
+        self.ids.append(rid)
+        self.required_scores.append(required)
+        self.theme_codes.append(code)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.ws.append(w)
+        self.hs.append(h)
+        if name is not None and name != f"Sala {rid + 1}":
+            self.names[pos] = name
+        if owner_npc is not None and owner_npc != f"Guardiao_{rid + 1}":
+            self.owners[pos] = owner_npc
+
+    def copy(self) -> "CompactMapDescriptor":
+        """Cópia independente das colunas (para alterar um mapa vindo do cache)."""
+        out = CompactMapDescriptor(self.seed, self.num_rooms, self.overlap_fallbacks)
+        for col in ("ids", "required_scores", "theme_codes", "xs", "ys", "ws", "hs"):
+            getattr(out, col).extend(getattr(self, col))
+        out.themes = list(self.themes)
+        out._theme_index = dict(self._theme_index)
+        out.names = dict(self.names)
+        out.owners = dict(self.owners)
+        return out
+
+    @classmethod
+    def from_map(cls, m: MapDescriptor) -> "CompactMapDescriptor":
+        out = cls(m.seed, m.num_rooms, m.overlap_fallbacks)
+        for r in m.rooms:
+            out.append(r.id, r.required_score, r.theme, r.x, r.y, r.w, r.h, r.name, r.owner_npc)
+        return out
+
+    def to_map(self) -> MapDescriptor:
+        return MapDescriptor(seed=self.seed, num_rooms=self.num_rooms,
+                             rooms=[r.to_descriptor() for r in self.rooms],
+                             overlap_fallbacks=self.overlap_fallbacks)
@@ -1,9 +1,12 @@
 """Versão jogável com Pygame Zero: desenha salas, player, colisão e perguntas MCQ."""
 
 from .settings import WIDTH, HEIGHT, FPS, DEFAULT_SEED, DEFAULT_NUM_ROOMS
-from .mapgen import generate_map
+from .mapcache import get_map
+from .mapgen import RoomLocator
 from .questions import sample_questions
+from .answers import is_choice_correct
 from .book import default_books_for_room
+from .render_cache import TextCache
 import random
 
 _HAS_PGZERO = True
@@ -37,6 +40,14 @@ except Exception:
 
 TITLE = "Mapa das Charadas"
 
+# superfícies de texto reaproveitadas entre frames (HUD, perguntas, alternativas)
+_TEXT_CACHE = TextCache()
+
+
+def _draw_text(text, pos, color="white", fontsize=24):
+    """Equivalente a `screen.draw.text` usando o cache de superfícies."""
+    screen.blit(_TEXT_CACHE.render(text, color=color, size=fontsize), pos)
+
 
 class Game:
     def __init__(self, seed=None, num_rooms=None):
@@ -46,7 +57,7 @@ class Game:
             num_rooms = DEFAULT_NUM_ROOMS
         self.seed = seed
         self.rng = random.Random(seed)
-        self.map = generate_map(seed, num_rooms=num_rooms)
+        self.map = get_map(seed, num_rooms=num_rooms)
         # simple player
         self.player = Actor('player') if _HAS_PGZERO else Actor()
         self.player.x = WIDTH // 2
@@ -59,18 +70,27 @@ class Game:
         self.choices = []
         self.selected = []
         self.score = 0
+        self._locator = None
+        self._locator_map = None
+        self._locator_len = 0
 
     def move(self, dx, dy, dt):
         self.player.x += dx * self.speed * dt
         self.player.y += dy * self.speed * dt
 
     def check_room_collision(self):
-        # retorna index da sala onde o centro do player está
+        # retorna a sala onde o centro do player está
         px, py = int(self.player.x), int(self.player.y)
-        for r in self.map.rooms:
-            if r.x <= px <= r.x + r.w and r.y <= py <= r.y + r.h:
-                return r
-        return None
+        return self._room_locator().room_at(px, py)
+
+    def _room_locator(self):
+        # índice montado uma vez por mapa; refeito se o mapa mudar
+        rooms = self.map.rooms
+        if self._locator_map is not self.map or self._locator_len != len(rooms):
+            self._locator = RoomLocator(rooms)
+            self._locator_map = self.map
+            self._locator_len = len(rooms)
+        return self._locator
 
     def enter_room(self, room):
         if room is None:
@@ -95,8 +115,7 @@ class Game:
         if all(x is not None for x in self.selected):
             correct = 0
             for i, q in enumerate(self.questions):
-                chosen = self.choices[i][self.selected[i]]
-                if str(chosen).strip().lower() == str(q['answer']).strip().lower():
+                if is_choice_correct(q, self.selected[i]):
                     correct += 1
             if correct == len(self.questions):
                 pts = sum(q.get('difficulty', 1) for q in self.questions)
@@ -133,14 +152,14 @@ def draw():
         # draw player
         screen.draw.filled_circle((int(G.player.x), int(G.player.y)), 8, 'blue')
         # HUD
-        screen.draw.text(f"Score: {G.score}", (10, 10))
+        _draw_text(f"Score: {G.score}", (10, 10))
         if G.in_question:
             y = 60
             for i, q in enumerate(G.questions):
-                screen.draw.text(f"{i+1}. {q['question']}", (20, y))
+                _draw_text(f"{i+1}. {q['question']}", (20, y))
                 y += 24
                 for j, c in enumerate(G.choices[i]):
-                    screen.draw.text(f"{j+1}) {c}", (40, y))
+                    _draw_text(f"{j+1}) {c}", (40, y))
                     y += 20
                 y += 10
     except Exception:
@@ -192,9 +211,11 @@ O arquivo é protegido para permitir import sem pgzero (ex.: testes).
 """
 
 from .settings import WIDTH, HEIGHT
-from .mapgen import generate_map
+from .mapcache import get_map
 from .settings import DEFAULT_SEED, DEFAULT_NUM_ROOMS
 from .questions import sample_questions
+from .answers import is_choice_correct
+from .render_cache import TiledBackgroundCache
 import random
 
 _HAS_PGZERO = True
@@ -202,9 +223,11 @@ try:
     from pgzero.builtins import Actor
     from pgzero import screen
     from pgzero.keyboard import keys
+    from pgzero.loaders import images
 except Exception:
     # stubs para permitir import sem pgzero
     _HAS_PGZERO = False
+    images = None
 
     class Actor:
         def __init__(self, *args, **kwargs):
@@ -239,7 +262,7 @@ class VisualGame:
         self.seed = seed
         self.num_rooms = num_rooms
         self.rng = random.Random(seed)
-        self.map = generate_map(seed, num_rooms=num_rooms)
+        self.map = get_map(seed, num_rooms=num_rooms)
         # player actor
         self.player = Actor('player') if _HAS_PGZERO else Actor()
         self.player.x = WIDTH // 2
@@ -276,12 +299,14 @@ class VisualGame:
         self.current_questions = qs
         # save choices and correct
         self.current_choices = [q.get('choices', []) for q in qs]
-        self.correct_answer = [str(q.get('answer')).strip().lower() for q in qs]
+        self.correct_answer = [q['answer_norm'] for q in qs]
         self.in_question = True
         self.selected_choice = [None] * len(qs)
 
 
 VG = VisualGame()
+# piso ladrilhado pré-composto (um blit por frame)
+_FLOOR_CACHE = TiledBackgroundCache()
 
 # API esperada pelo pgzero
 def update(dt):
@@ -303,18 +328,14 @@ def draw():
     try:
         # prefer to use Actor image surfaces if available
         has_images = _HAS_PGZERO
-        # tile size (we used 64x64 floor)
-        tile_w, tile_h = 64, 64
-        # draw a tiled background
-        for x in range(0, WIDTH, tile_w):
-            for y in range(0, HEIGHT, tile_h):
-                try:
-                    if has_images:
-                        screen.blit('floor', (x, y))
-                    else:
-                        screen.draw.filled_rect((x, y, tile_w, tile_h), (200, 200, 200))
-                except Exception:
-                    screen.draw.filled_rect((x, y, tile_w, tile_h), (200, 200, 200))
+        # draw a tiled background: cached floor layer in one blit
+        try:
+            if has_images:
+                screen.blit(_FLOOR_CACHE.get(images.floor, WIDTH, HEIGHT), (0, 0))
+            else:
+                screen.draw.filled_rect((0, 0, WIDTH, HEIGHT), (200, 200, 200))
+        except Exception:
+            screen.draw.filled_rect((0, 0, WIDTH, HEIGHT), (200, 200, 200))
 
         # draw rooms as walls or rect outlines
         for r in VG.map.rooms:
@@ -349,7 +370,7 @@ def draw():
 
         # HUD
         try:
-            screen.draw.text(f"Score: {VG.player_score}", (10, 10))
+            _draw_text(f"Score: {VG.player_score}", (10, 10))
         except Exception:
             pass
     except Exception:
@@ -379,8 +400,7 @@ def on_key_down(key):
             if all(x is not None for x in VG.selected_choice):
                 correct = 0
                 for i, q in enumerate(VG.current_questions):
-                    choice_text = VG.current_choices[i][VG.selected_choice[i]]
-                    if choice_text.strip().lower() == str(q['answer']).strip().lower():
+                    if is_choice_correct(q, VG.selected_choice[i]):
                         correct += 1
                 if correct == len(VG.current_questions):
                     VG.player_score += sum(q.get('difficulty', 1) for q in VG.current_questions)
@@ -0,0 +1,39 @@
+"""Agregados de progresso mantidos de forma incremental.
+
+Em vez de somar livros e guardiões a cada frame, os contadores são
+atualizados nos eventos discretos do jogo (livro/guardião adicionado, livro
+lido, guardião derrotado). HUD e checagem de conclusão ficam O(1).
+"""
+
+
+class ProgressTracker:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.unread_book_points = 0
+        self.remaining_questions = 0
+        self.undefeated_guardians = 0
+
+    def add_book(self, points: int, read: bool = False):
+        if not read:
+            self.unread_book_points += points
+
+    def add_guardian(self, num_questions: int, defeated: bool = False):
+        if not defeated:
+            self.remaining_questions += num_questions
+            self.undefeated_guardians += 1
+
+    def book_read(self, points: int):
+        self.unread_book_points -= points
+
+    def guardian_defeated(self, num_questions: int):
+        self.remaining_questions -= num_questions
+        self.undefeated_guardians -= 1
+
+    def all_guardians_defeated(self) -> bool:
+        return self.undefeated_guardians == 0
+
+    def max_possible(self, score: int) -> int:
+        """Pontuação máxima alcançável a partir de `score`."""
+        return score + self.unread_book_points + self.remaining_questions
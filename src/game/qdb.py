@@ -0,0 +1,307 @@
+"""Banco de perguntas em SQLite (backend opcional de `questions.py`).
+
+Usa apenas o `sqlite3` da biblioteca padrão e funciona offline. As perguntas
+ficam numa tabela única indexada por (tema, dificuldade); tags e perguntas já
+vistas por cada jogador ficam em tabelas próprias, também indexadas, para que
+os filtros virem buscas em índice em vez de varreduras.
+
+As consultas usam SQL fixo com parâmetros (`?`), então o `sqlite3` reaproveita
+os statements preparados do seu cache entre chamadas. Tags nunca são buscadas
+pergunta a pergunta: `load()` as lê com um JOIN por tema e `get_many()` com um
+`IN (...)` por lote.
+
+`sample()` guarda os rowids elegíveis por (tema, faixa de dificuldade, tags)
+e, por jogador, as posições já vistas (atualizadas por `mark_seen()`); assim
+cada sorteio custa O(count), sem trazer todos os rowids para o Python.
+`import_questions()` descarta essas listas.
+
+Importar os pools JSON existentes e ativar o backend:
+
+    python -m game.qdb questions.db math logic python
+
+    from game import questions
+    questions.use_database("questions.db")
+"""
+import bisect
+import json
+import sqlite3
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    rowid INTEGER PRIMARY KEY,
+    theme TEXT NOT NULL,
+    qid INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    explanation TEXT NOT NULL DEFAULT '',
+    difficulty INTEGER NOT NULL DEFAULT 1,
+    UNIQUE (theme, qid)
+);
+CREATE INDEX IF NOT EXISTS questions_theme_difficulty ON questions (theme, difficulty);
+CREATE TABLE IF NOT EXISTS question_tags (
+    question INTEGER NOT NULL REFERENCES questions (rowid) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (tag, question)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS question_tags_question ON question_tags (question);
+CREATE TABLE IF NOT EXISTS seen (
+    player TEXT NOT NULL,
+    question INTEGER NOT NULL REFERENCES questions (rowid) ON DELETE CASCADE,
+    PRIMARY KEY (player, question)
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = "rowid, qid, question, answer, explanation, difficulty"
+# tags de todas as perguntas de um tema, numa consulta só
+_SELECT_THEME_TAGS = (
+    "SELECT t.question, t.tag FROM question_tags t JOIN questions q ON q.rowid = t.question"
+    " WHERE q.theme = ? ORDER BY t.question, t.tag"
+)
+# limite de parâmetros `?` por consulta em versões antigas do SQLite
+_MAX_PARAMS = 900
+
+
+class QuestionDB:
+    """Conexão com um banco de perguntas SQLite."""
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        # (tema, dif. mínima, dif. máxima, tags) -> (dificuldades, rowids) das
+        # elegíveis em ordem (dificuldade, rowid); refeito após import_questions()
+        self._eligible = {}
+        # (jogador, chave de _eligible) -> posições já vistas, ordenadas;
+        # mantido por mark_seen()/reset_seen()
+        self._seen = {}
+
+    def close(self):
+        self.conn.close()
+
+    def themes(self) -> List[str]:
+        return [t for (t,) in self.conn.execute("SELECT DISTINCT theme FROM questions ORDER BY theme")]
+
+    def count(self, theme: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM questions WHERE theme = ?", (theme,)).fetchone()[0]
+
+    def import_questions(self, theme: str, questions: Iterable[Dict]) -> int:
+        """Importa perguntas no formato do JSON; atualiza as de mesmo (tema, id).
+
+        Atualizar preserva o rowid, então o histórico de `seen` continua válido.
+        Perguntas e tags são gravadas com `executemany`; os rowids saem de uma
+        única consulta (qid -> rowid) do tema, sem uma consulta por pergunta.
+        """
+        rows = {}
+        n = 0
+        for q in questions:
+            qid = int(q.get("id", n + 1))
+            # id repetido: vale o último, como numa sequência de upserts
+            rows.pop(qid, None)
+            rows[qid] = q
+            n += 1
+        select_ids = "SELECT qid, rowid FROM questions WHERE theme = ?"
+        with self.conn:
+            cur = self.conn.cursor()
+            existing = {qid for qid, _ in cur.execute(select_ids, (theme,))}
+            cur.executemany(
+                "INSERT INTO questions (theme, qid, question, answer, explanation, difficulty)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (theme, qid) DO UPDATE SET question = excluded.question,"
+                " answer = excluded.answer, explanation = excluded.explanation,"
+                " difficulty = excluded.difficulty",
+                ((theme, qid, str(q.get("question", "")), str(q.get("answer", "")),
+                  str(q.get("explanation", "")), int(q.get("difficulty", 1))) for qid, q in rows.items()),
+            )
+            rowid_of = dict(cur.execute(select_ids, (theme,)))
+            # só perguntas que já existiam podem ter tags antigas
+            cur.executemany("DELETE FROM question_tags WHERE question = ?",
+                            ((rowid_of[qid],) for qid in rows if qid in existing))
+            cur.executemany(
+                "INSERT OR IGNORE INTO question_tags (question, tag) VALUES (?, ?)",
+                ((rowid_of[qid], str(t)) for qid, q in rows.items() for t in q.get("tags") or ()),
+            )
+        self._eligible.clear()
+        self._seen.clear()
+        return n
+
+    def import_json(self, theme: str, path) -> int:
+        with open(path, "r", encoding="utf-8") as f:
+            return self.import_questions(theme, json.load(f))
+
+    def _query(self, theme, min_difficulty, max_difficulty, tags, player):
+        sql = ["SELECT q.rowid FROM questions q WHERE q.theme = ? AND q.difficulty BETWEEN ? AND ?"]
+        params = [theme, min_difficulty, max_difficulty if max_difficulty is not None else 2 ** 31]
+        for tag in tags or ():
+            sql.append("AND EXISTS (SELECT 1 FROM question_tags t WHERE t.tag = ? AND t.question = q.rowid)")
+            params.append(tag)
+        if player is not None:
+            sql.append("AND NOT EXISTS (SELECT 1 FROM seen s WHERE s.player = ? AND s.question = q.rowid)")
+            params.append(player)
+        sql.append("ORDER BY q.difficulty, q.rowid")
+        return " ".join(sql), params
+
+    def ids(self, theme: str, min_difficulty: int = 1, max_difficulty: Optional[int] = None,
+            tags: Sequence[str] = (), player: Optional[str] = None) -> List[int]:
+        """Rowids elegíveis, em ordem estável (dificuldade, inserção)."""
+        sql, params = self._query(theme, min_difficulty, max_difficulty, tags, player)
+        return [r for (r,) in self.conn.execute(sql, params)]
+
+    @staticmethod
+    def _row_to_dict(row, tags_by_rowid) -> Dict:
+        rowid, qid, question, answer, explanation, difficulty = row
+        q = {"id": qid, "question": question, "answer": answer, "explanation": explanation, "difficulty": difficulty}
+        tags = tags_by_rowid.get(rowid)
+        if tags:
+            q["tags"] = tags
+        return q
+
+    @staticmethod
+    def _group_tags(pairs) -> Dict[int, List[str]]:
+        out: Dict[int, List[str]] = {}
+        for rowid, tag in pairs:
+            out.setdefault(rowid, []).append(tag)
+        return out
+
+    def get_many(self, rowids: Sequence[int]) -> List[Dict]:
+        """Perguntas dos `rowids`, na mesma ordem; linhas e tags em lotes com `IN (...)`."""
+        rows, tags = {}, {}
+        for i in range(0, len(rowids), _MAX_PARAMS):
+            chunk = list(rowids[i:i + _MAX_PARAMS])
+            marks = ", ".join("?" * len(chunk))
+            for row in self.conn.execute(f"SELECT {_COLUMNS} FROM questions WHERE rowid IN ({marks})", chunk):
+                rows[row[0]] = row
+            tags.update(self._group_tags(self.conn.execute(
+                f"SELECT question, tag FROM question_tags WHERE question IN ({marks}) ORDER BY question, tag", chunk)))
+        return [self._row_to_dict(rows[r], tags) for r in rowids if r in rows]
+
+    def get(self, rowid: int) -> Optional[Dict]:
+        found = self.get_many([rowid])
+        return found[0] if found else None
+
+    def load(self, theme: str) -> List[Dict]:
+        rows = self.conn.execute(f"SELECT {_COLUMNS} FROM questions WHERE theme = ? ORDER BY qid", (theme,)).fetchall()
+        tags = self._group_tags(self.conn.execute(_SELECT_THEME_TAGS, (theme,)))
+        return [self._row_to_dict(row, tags) for row in rows]
+
+    @staticmethod
+    def _eligible_key(theme, min_difficulty, max_difficulty, tags):
+        return (theme, min_difficulty, max_difficulty, tuple(tags or ()))
+
+    def _eligible_ids(self, key):
+        cached = self._eligible.get(key)
+        if cached is None:
+            sql, params = self._query(*key, None)
+            sql = sql.replace("SELECT q.rowid", "SELECT q.difficulty, q.rowid", 1)
+            difficulties, rowids = array("q"), array("q")
+            for d, r in self.conn.execute(sql, params):
+                difficulties.append(d)
+                rowids.append(r)
+            cached = self._eligible[key] = (difficulties, rowids)
+        return cached
+
+    @staticmethod
+    def _positions(pairs, difficulties, rowids):
+        """Posições em `rowids` dos pares (dificuldade, rowid) presentes na lista."""
+        for d, r in pairs:
+            lo = bisect.bisect_left(difficulties, d)
+            hi = bisect.bisect_right(difficulties, d, lo)
+            pos = bisect.bisect_left(rowids, r, lo, hi)
+            if pos < hi and rowids[pos] == r:
+                yield pos
+
+    def _seen_positions(self, player, key) -> List[int]:
+        """Posições (ordenadas) na lista de elegíveis de `key` que `player` já viu."""
+        seen = self._seen.get((player, key))
+        if seen is None:
+            pairs = self.conn.execute(
+                "SELECT q.difficulty, q.rowid FROM seen s JOIN questions q ON q.rowid = s.question"
+                " WHERE s.player = ? AND q.theme = ?", (player, key[0]))
+            seen = self._seen[(player, key)] = sorted(self._positions(pairs, *self._eligible_ids(key)))
+        return seen
+
+    @staticmethod
+    def _nth_unseen(n: int, seen: List[int]) -> int:
+        """Posição da n-ésima (a partir de 0) entrada fora de `seen`."""
+        pos = n
+        while True:
+            nxt = n + bisect.bisect_right(seen, pos)
+            if nxt == pos:
+                return pos
+            pos = nxt
+
+    def sample(self, theme: str, rng, count: int = 3, min_difficulty: int = 1,
+               max_difficulty: Optional[int] = None, tags: Sequence[str] = (),
+               player: Optional[str] = None) -> List[Dict]:
+        """Amostra sem reposição entre as perguntas que passam nos filtros.
+
+        Os rowids elegíveis por (tema, faixa de dificuldade, tags) são lidos uma
+        vez e guardados até o próximo `import_questions()`; o filtro de jogador
+        lê só as perguntas já vistas por ele. Cada chamada custa então
+        O(count + vistas) em vez de O(n). Sorteia as mesmas posições que
+        `rng.sample(self.ids(...), count)`, então é reprodutível para a mesma
+        seed de `rng`.
+        """
+        key = self._eligible_key(theme, min_difficulty, max_difficulty, tags)
+        _, rowids = self._eligible_ids(key)
+        if player is None:
+            positions = rng.sample(range(len(rowids)), min(count, len(rowids)))
+        else:
+            seen = self._seen_positions(player, key)
+            total = len(rowids) - len(seen)
+            positions = [self._nth_unseen(n, seen) for n in rng.sample(range(total), min(count, total))]
+        return self.get_many([rowids[pos] for pos in positions])
+
+    def mark_seen(self, player: str, theme: str, qids: Iterable[int]):
+        qids = [int(qid) for qid in qids]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (player, question)"
+                " SELECT ?, rowid FROM questions WHERE theme = ? AND qid = ?",
+                [(player, theme, qid) for qid in qids],
+            )
+        keys = [k for (p, k) in self._seen if p == player and k[0] == theme]
+        if not keys or not qids:
+            return
+        # atualiza as posições em cache só com as perguntas recém-vistas
+        pairs = []
+        for i in range(0, len(qids), _MAX_PARAMS):
+            chunk = qids[i:i + _MAX_PARAMS]
+            pairs += self.conn.execute(
+                f"SELECT difficulty, rowid FROM questions WHERE theme = ? AND qid IN ({', '.join('?' * len(chunk))})",
+                [theme] + chunk).fetchall()
+        for key in keys:
+            seen = self._seen[(player, key)]
+            for pos in self._positions(pairs, *self._eligible_ids(key)):
+                i = bisect.bisect_left(seen, pos)
+                if i == len(seen) or seen[i] != pos:
+                    seen.insert(i, pos)
+
+    def reset_seen(self, player: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM seen WHERE player = ?", (player,))
+        for k in [k for k in self._seen if k[0] == player]:
+            del self._seen[k]
+
+
+def main(argv=None):
+    from . import questions
+
+    argv = argv if argv is not None else sys.argv[1:]
+    if not argv:
+        print("uso: python -m game.qdb BANCO.db [tema ...]")
+        return 2
+    db = QuestionDB(Path(argv[0]))
+    for theme in argv[1:] or questions.THEMES:
+        n = db.import_questions(theme, questions.iter_theme_pool(theme))
+        print(f"{theme}: {n} perguntas importadas")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
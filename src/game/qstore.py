@@ -0,0 +1,187 @@
+"""Armazenamento binário compacto para bancos de perguntas.
+
+Formato `questions_<tema>.qbin` (little-endian):
+
+- cabeçalho: magic `QBN1`, versão (u32) e número de perguntas (u32);
+- (versão 2) número de dificuldades distintas (u32) e, para cada uma em ordem
+  crescente, (dificuldade i32, posição do primeiro registro u32);
+- uma tabela de registros de largura fixa (32 bytes cada): id, dificuldade,
+  e (offset, tamanho) de pergunta, resposta e explicação dentro do blob;
+- o blob com os textos em UTF-8, concatenados.
+
+Na versão 2 os registros ficam ordenados (de forma estável) por dificuldade,
+então o índice por dificuldade sai direto do cabeçalho: abrir um banco não
+percorre nem ordena os registros. Arquivos da versão 1 continuam legíveis.
+
+O arquivo é aberto via `mmap`: abrir um banco grande só lê o cabeçalho, e os
+textos são decodificados apenas quando acessados (`LazyQuestion`). Id e
+dificuldade são lidos direto da tabela, sem materializar perguntas.
+`QuestionStore` mantém o mapeamento aberto até `close()` (ou o fim de um
+bloco `with`); `questions.py` fecha o store de um pool ao descartá-lo do cache.
+
+Converter os pools JSON existentes:
+
+    python -m game.qstore math logic python
+"""
+import mmap
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Dict, Iterable
+
+MAGIC = b"QBN1"
+VERSION = 2
+HEADER = struct.Struct("<4sII")
+BUCKET_COUNT = struct.Struct("<I")
+# dificuldade, posição do primeiro registro com ela
+BUCKET = struct.Struct("<iI")
+# id, difficulty, question (off, len), answer (off, len), explanation (off, len)
+RECORD = struct.Struct("<iiIIIIII")
+TEXT_FIELDS = ("question", "answer", "explanation")
+
+
+def write_store(path, questions: Iterable[Dict]):
+    """Grava perguntas (dicts no formato do JSON) no formato binário.
+
+    Os registros são gravados ordenados por dificuldade (estável: empates
+    mantêm a ordem de entrada).
+    """
+    keyed = [(int(q.get("difficulty", 1)), int(q.get("id", i + 1)), q) for i, q in enumerate(questions)]
+    keyed.sort(key=lambda k: k[0])
+    records = []
+    buckets = []
+    blob = bytearray()
+    for difficulty, qid, q in keyed:
+        if not buckets or buckets[-1][0] != difficulty:
+            buckets.append((difficulty, len(records)))
+        spans = []
+        for field in TEXT_FIELDS:
+            data = str(q.get(field, "")).encode("utf-8")
+            spans.extend((len(blob), len(data)))
+            blob += data
+        records.append(RECORD.pack(qid, difficulty, *spans))
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        f.write(BUCKET_COUNT.pack(len(buckets)))
+        f.writelines(BUCKET.pack(*b) for b in buckets)
+        f.writelines(records)
+        f.write(blob)
+    tmp.replace(path)
+
+
+class LazyQuestion(Mapping):
+    """Visão somente-leitura de um registro; textos decodificados sob demanda."""
+
+    __slots__ = ("_store", "_pos")
+
+    def __init__(self, store, pos):
+        self._store = store
+        self._pos = pos
+
+    def __getitem__(self, key):
+        return self._store.field(self._pos, key)
+
+    def __iter__(self):
+        return iter(("id", "difficulty") + TEXT_FIELDS)
+
+    def __len__(self):
+        return 2 + len(TEXT_FIELDS)
+
+    def copy(self) -> Dict:
+        """Materializa o registro como dict (mesmo contrato de `dict.copy`)."""
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"LazyQuestion({self._store.path.name}#{self._pos})"
+
+
+class QuestionStore(Sequence):
+    """Banco de perguntas mapeado em memória a partir de um arquivo `.qbin`."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            self._mm.close()
+            raise ValueError("Arquivo de perguntas inválido: %s" % self.path)
+        self._count = count
+        # (dificuldade, primeira posição) em ordem crescente; None na versão 1,
+        # cujos registros não estão ordenados
+        self.buckets = None
+        self._records_start = HEADER.size
+        if version >= 2:
+            (n,) = BUCKET_COUNT.unpack_from(self._mm, HEADER.size)
+            start = HEADER.size + BUCKET_COUNT.size
+            self.buckets = [BUCKET.unpack_from(self._mm, start + i * BUCKET.size) for i in range(n)]
+            self._records_start = start + n * BUCKET.size
+        self._blob_start = self._records_start + count * RECORD.size
+
+    def close(self):
+        """Libera o mapeamento (no Windows, necessário antes de regravar o arquivo)."""
+        self._mm.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._mm.closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(self._count))]
+        if pos < 0:
+            pos += self._count
+        if not 0 <= pos < self._count:
+            raise IndexError(pos)
+        return LazyQuestion(self, pos)
+
+    def _record(self, pos):
+        return RECORD.unpack_from(self._mm, self._records_start + pos * RECORD.size)
+
+    def difficulty(self, pos) -> int:
+        return struct.unpack_from("<i", self._mm, self._records_start + pos * RECORD.size + 4)[0]
+
+    def difficulties(self):
+        return [self.difficulty(i) for i in range(self._count)]
+
+    def field(self, pos, key):
+        rec = self._record(pos)
+        if key == "id":
+            return rec[0]
+        if key == "difficulty":
+            return rec[1]
+        try:
+            i = TEXT_FIELDS.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        off, size = rec[2 + 2 * i], rec[3 + 2 * i]
+        start = self._blob_start + off
+        return self._mm[start:start + size].decode("utf-8")
+
+
+def main(argv=None):
+    from . import questions
+
+    themes = (argv if argv is not None else sys.argv[1:]) or questions.THEMES
+    for theme in themes:
+        # sempre a partir do JSON/NDJSON, que é a fonte editável
+        pool = list(questions.iter_theme_pool(theme))
+        path = questions.DATA_DIR / f"questions_{theme}.qbin"
+        write_store(path, pool)
+        print(f"{theme}: {len(pool)} perguntas -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,91 +2,531 @@
 
 Gera pools de 100 perguntas por tema (math, logic, python) se não existirem e fornece loaders.
 Formato simples para permitir testes e prototype.
+
+Pools gerados são gravados em `questions_<tema>.ndjson` (um registro por
+linha), escritos direto do gerador sem montar a lista em memória. O formato
+legado `questions_<tema>.json` (lista JSON indentada) continua sendo lido e
+pode ser gerado com `_ensure_pool(tema, fmt="json")`.
+
+Os pools lidos ficam em cache no processo (por tema) e só são relidos quando o
+arquivo do tema muda em disco (mtime/tamanho). Cada pool em cache vem com um
+índice por dificuldade, de modo que amostrar k perguntas custa O(k)
+independentemente do tamanho do pool.
+
+Se existir `questions_<tema>.qbin` (ver `qstore.py`) pelo menos tão recente
+quanto o JSON/NDJSON, ele é usado no lugar: o arquivo é mapeado em memória e
+os textos só são lidos quando a pergunta é acessada.
+
+Pools sintéticos grandes (testes de carga) ficam num diretório próprio,
+`data/stream/questions_<tema>.ndjson`, gerados em streaming com:
+
+    python -m game.questions math 1000000
+
+Eles só são usados depois de `use_streaming_pools(True)`; sem isso o arquivo
+é ignorado e o jogo continua com o pool normal do tema. Esses pools nunca são
+carregados inteiros: `sample_questions()` os percorre com amostragem por
+reservatório, e `sample_quiz_sets()` preenche todos os conjuntos numa única
+leitura.
+
+Para bancos maiores há um backend SQLite opcional (`qdb.py`): depois de
+`use_database(...)`, `load_questions()`/`sample_questions()` passam a consultar
+o banco, que também aceita filtros por faixa de dificuldade, tags e perguntas
+já vistas por um jogador.
+
+`build_choices()` gera as alternativas de muitas perguntas numa chamada; com
+NumPy disponível, os temas numéricos podem ser gerados de forma vetorizada
+(usado por `sample_quiz_sets()` para pré-gerar conjuntos de um mapa inteiro).
 """
+import bisect
+import heapq
 import json
+import math
+from array import array
 from pathlib import Path
 from typing import List, Dict
 
+from .answers import prepare_question
+from .themes import THEME_NAMES, get_theme, is_theme
+
 DATA_DIR = Path(__file__).resolve().parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
-THEMES = ["math", "logic", "python"]
+# nomes dos temas registrados (a mesma lista de `themes.THEME_NAMES`)
+THEMES = THEME_NAMES
+
+# tema -> (assinatura do arquivo, PoolIndex)
+_POOL_CACHE: Dict[str, tuple] = {}
+# backend SQLite ativo (QuestionDB) ou None para os arquivos em DATA_DIR
+_DB = None
+# pools NDJSON de teste de carga só entram com use_streaming_pools(True)
+_STREAMING = False
+# NumPy (opcional) só é importado na primeira chamada vetorizada de
+# build_choices(): importar `game` não paga o custo. False = indisponível
+_np = None
+# as 6 ordens possíveis de (correta, d1, d2), criadas junto com o import
+_PERMUTATIONS = None
+
+
+class PoolIndex:
+    """Pool de um tema ordenado por dificuldade, com offsets cumulativos.
+
+    `items` preserva a ordem do arquivo (lista de dicts ou `QuestionStore`);
+    `order` lista as posições ordenadas (estável) por dificuldade e, para cada
+    dificuldade distinta, guarda a posição em `order` da primeira pergunta
+    com ela. As perguntas elegíveis para uma dificuldade mínima formam então
+    um único intervalo contíguo. `difficulties` evita materializar os itens
+    quando o armazenamento já expõe essa coluna; `buckets` (pares
+    (dificuldade, início) de itens já ordenados, como num `.qbin`) dispensa
+    até a ordenação.
+    """
+
+    def __init__(self, items, difficulties=None, buckets=None):
+        self.items = items
+        if buckets is None:
+            if difficulties is None:
+                difficulties = [q.get("difficulty", 1) for q in items]
+            self.order = array("l", sorted(range(len(items)), key=difficulties.__getitem__))
+            buckets = []
+            for pos, i in enumerate(self.order):
+                if not buckets or buckets[-1][0] != difficulties[i]:
+                    buckets.append((difficulties[i], pos))
+        else:
+            self.order = range(len(items))
+        self._bucket_difficulties = [d for d, _ in buckets]
+        self._bucket_starts = [start for _, start in buckets]
+
+    def __len__(self):
+        return len(self.items)
+
+    def start_for(self, min_difficulty: int) -> int:
+        i = bisect.bisect_left(self._bucket_difficulties, min_difficulty)
+        return self._bucket_starts[i] if i < len(self._bucket_starts) else len(self.order)
+
+    def count_at_least(self, min_difficulty: int) -> int:
+        return len(self.order) - self.start_for(min_difficulty)
+
+    def sample(self, rng, count: int, min_difficulty: int = 1) -> List[Dict]:
+        """Amostra sem reposição, O(count); reprodutível para a mesma seed de `rng`."""
+        start = self.start_for(min_difficulty)
+        eligible = range(start, len(self.order))
+        k = min(count, len(eligible))
+        return [self.items[self.order[i]] for i in rng.sample(eligible, k)]
+
+    def sample_many(self, rng, num_sets: int, count: int, min_difficulty: int = 1) -> List[List[Dict]]:
+        return [self.sample(rng, count, min_difficulty) for _ in range(num_sets)]
+
+    def close(self):
+        """Libera o armazenamento por trás de `items` (ex.: o mmap de um `QuestionStore`)."""
+        close = getattr(self.items, "close", None)
+        if close is not None:
+            close()
+
+
+class StreamingPool:
+    """Pool em NDJSON (um objeto JSON por linha) lido sob demanda.
+
+    Nunca materializa o arquivo: iterar lê linha a linha e `sample()` usa
+    amostragem por reservatório, com memória proporcional a `count`.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.items = self
+
+    def __iter__(self):
+        return iter_pool(self.path)
+
+    def sample(self, rng, count: int, min_difficulty: int = 1) -> List[Dict]:
+        eligible = (q for q in self if q.get("difficulty", 1) >= min_difficulty)
+        return reservoir_sample(eligible, rng, count)
+
+    def sample_many(self, rng, num_sets: int, count: int, min_difficulty: int = 1) -> List[List[Dict]]:
+        """`num_sets` amostras independentes numa única leitura do arquivo."""
+        eligible = (q for q in self if q.get("difficulty", 1) >= min_difficulty)
+        return reservoir_sample_many(eligible, rng, count, num_sets)
 
+    def close(self):
+        # o arquivo só fica aberto durante cada leitura
+        pass
 
-def _ensure_pool(theme: str, total: int = 100):
-    path = DATA_DIR / f"questions_{theme}.json"
-    if path.exists():
-        return
-    pool = []
+
+def generate_pool(theme: str, total: int = 100):
+    """Gera as perguntas sintéticas do tema, uma a uma."""
+    make_question = get_theme(theme).make_question
+    span = max(1, total - 1)
     for i in range(1, total + 1):
-        if theme == "math":
-            q = f"Quanto é {i} + {i}?"
-            a = str(i + i)
-            expl = f"Soma básica: {i}+{i}"
-            difficulty = 1 + (i - 1) * 4 // (total - 1)  # espalha dificuldade 1..5
-        elif theme == "logic":
-            q = f"Se A implica B e B implica C, então A implica C? (sim/não) [{i}]"
-            a = "sim"
-            expl = "Transitividade lógica"
-            difficulty = 1 + (i - 1) * 4 // (total - 1)
-        else:  # python
-            q = f"Qual expressão Python resulta em {i}: ' {i} ' ? (responda com {i})"
-            a = str(i)
-            expl = "Conversão simples/string"
-            difficulty = 1 + (i - 1) * 4 // (total - 1)
-        pool.append({"id": i, "question": q, "answer": a, "explanation": expl, "difficulty": difficulty})
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(pool, f, ensure_ascii=False, indent=2)
+        q, a, expl = make_question(i)
+        difficulty = 1 + (i - 1) * 4 // span  # espalha dificuldade 1..5
+        yield {"id": i, "question": q, "answer": a, "explanation": expl, "difficulty": difficulty}
 
 
-def load_questions(theme: str) -> List[Dict]:
+def write_pool_ndjson(path, records) -> int:
+    """Grava `records` (qualquer iterável) em NDJSON sem acumulá-los em memória."""
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    n = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        for q in records:
+            f.write(json.dumps(q, ensure_ascii=False))
+            f.write("\n")
+            n += 1
+    tmp.replace(path)
+    return n
+
+
+def iter_pool(path):
+    """Lê um pool NDJSON registro a registro (linhas em branco são ignoradas)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def reservoir_sample(records, rng, count: int) -> List[Dict]:
+    """Amostra `count` itens sem reposição de um iterável de tamanho desconhecido."""
+    reservoir = []
+    for seen, q in enumerate(records):
+        if seen < count:
+            reservoir.append(q)
+        else:
+            j = rng.randrange(seen + 1)
+            if j < count:
+                reservoir[j] = q
+    return reservoir
+
+
+def _open_unit(rng) -> float:
+    """Uniforme em (0, 1)."""
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+
+def reservoir_sample_many(records, rng, count: int, num_sets: int) -> List[List[Dict]]:
+    """`num_sets` amostras independentes de `count` itens numa só passada por `records`.
+
+    Cada reservatório sorteia quantos itens pular até a próxima troca
+    (algoritmo L de Li), então o custo por item lido não cresce com
+    `num_sets`: só os reservatórios cuja vez chegou consomem `rng`.
+    """
+    reservoirs = [[] for _ in range(num_sets)]
+    if count <= 0 or num_sets <= 0:
+        return reservoirs
+    weights = [1.0] * num_sets
+    # fila (próxima posição a trocar, reservatório)
+    due = []
+
+    def schedule(r, pos):
+        weights[r] *= math.exp(math.log(_open_unit(rng)) / count)
+        gap = math.log(_open_unit(rng)) / math.log1p(-weights[r]) if weights[r] < 1.0 else 0.0
+        heapq.heappush(due, (pos + int(gap) + 1, r))
+
+    for seen, q in enumerate(records):
+        if seen < count:
+            for res in reservoirs:
+                res.append(q)
+            if seen == count - 1:
+                for r in range(num_sets):
+                    schedule(r, seen)
+            continue
+        while due and due[0][0] == seen:
+            _, r = heapq.heappop(due)
+            reservoirs[r][rng.randrange(count)] = q
+            schedule(r, seen)
+    return reservoirs
+
+
+def _ensure_pool(theme: str, total: int = 100, fmt: str = "ndjson") -> Path:
+    """Garante um pool editável do tema (JSON ou NDJSON) e devolve seu caminho.
+
+    Sem nenhum, grava `total` perguntas: em NDJSON, linha a linha a partir do
+    gerador; com `fmt="json"`, no formato legado (lista indentada).
+    """
+    existing = [(st.st_mtime_ns, path) for path in (DATA_DIR / f"questions_{theme}{suffix}" for suffix in _TEXT_SUFFIXES)
+                if (st := _stat(path)) is not None]
+    if existing:
+        return max(existing)[1]
+    if fmt == "json":
+        path = DATA_DIR / f"questions_{theme}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(list(generate_pool(theme, total)), f, ensure_ascii=False, indent=2)
+    else:
+        path = DATA_DIR / f"questions_{theme}.ndjson"
+        write_pool_ndjson(path, generate_pool(theme, total))
+    return path
+
+
+def iter_theme_pool(theme: str):
+    """Perguntas do pool editável do tema (gerando-o se preciso), na ordem do arquivo."""
+    path = _ensure_pool(theme)
+    if path.suffix == ".ndjson":
+        return iter_pool(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return iter(json.load(f))
+
+
+def _stream_dir() -> Path:
+    """Diretório dos pools NDJSON de teste de carga (fora dos pools do jogo)."""
+    return DATA_DIR / "stream"
+
+
+def _stat(path: Path):
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+# em caso de empate no mtime, vence o formato que vem primeiro
+_POOL_SUFFIXES = (".qbin", ".json", ".ndjson")
+# formatos editáveis, a fonte para gerar .qbin e importar no SQLite
+_TEXT_SUFFIXES = (".json", ".ndjson")
+
+
+def _pool_source(theme: str):
+    """Arquivo que serve o tema e sua assinatura (formato, mtime, tamanho).
+
+    Com `use_streaming_pools(True)`, `stream/questions_<tema>.ndjson` tem
+    prioridade se existir. Fora isso, entre `questions_<tema>.{qbin,json,ndjson}`
+    existentes usa o mais recente; sem nenhum, gera o pool padrão.
+    """
+    best = None
+    if _STREAMING:
+        path = _stream_dir() / f"questions_{theme}.ndjson"
+        st = _stat(path)
+        if st is not None:
+            best = (path, st)
+    for suffix in _POOL_SUFFIXES if best is None else ():
+        path = DATA_DIR / f"questions_{theme}{suffix}"
+        st = _stat(path)
+        if st is not None and (best is None or st.st_mtime_ns > best[1].st_mtime_ns):
+            best = (path, st)
+    if best is None:
+        path = _ensure_pool(theme)
+        best = (path, path.stat())
+    path, st = best
+    return path, (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _load_index(path: Path):
+    if path.suffix == ".qbin":
+        from .qstore import QuestionStore
+
+        store = QuestionStore(path)
+        if store.buckets is not None:
+            return PoolIndex(store, buckets=store.buckets)
+        return PoolIndex(store, store.difficulties())
+    if path.parent == _stream_dir():
+        return StreamingPool(path)
+    if path.suffix == ".ndjson":
+        return PoolIndex(list(iter_pool(path)))
+    with open(path, "r", encoding="utf-8") as f:
+        return PoolIndex(json.load(f))
+
+
+def _cached_index(theme: str):
+    """Índice do tema vindo do cache; relê o arquivo apenas se ele mudou."""
     theme = theme.lower()
-    if theme not in THEMES:
+    if not is_theme(theme):
         raise ValueError("Tema desconhecido: %s" % theme)
-    _ensure_pool(theme)
-    path = DATA_DIR / f"questions_{theme}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    path, sig = _pool_source(theme)
+    cached = _POOL_CACHE.get(theme)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    index = _load_index(path)
+    _POOL_CACHE[theme] = (sig, index)
+    if cached is not None:
+        cached[1].close()
+    return index
+
+
+def _cached_pool(theme: str):
+    return _cached_index(theme).items
+
+
+def clear_question_cache():
+    for _, index in _POOL_CACHE.values():
+        index.close()
+    _POOL_CACHE.clear()
 
 
-def sample_questions(theme: str, rng, count: int = 3, min_difficulty: int = 1):
-    pool = [q for q in load_questions(theme) if q.get("difficulty", 1) >= min_difficulty]
-    if not pool:
+def use_database(db=None):
+    """Ativa o backend SQLite (`QuestionDB` ou caminho do banco); None volta aos arquivos."""
+    global _DB
+    if db is not None and not hasattr(db, "sample"):
+        from .qdb import QuestionDB
+
+        db = QuestionDB(db)
+    _DB = db
+    return db
+
+
+def use_streaming_pools(enabled: bool = True) -> bool:
+    """Liga/desliga o uso dos pools `questions_<tema>.ndjson` (testes de carga)."""
+    global _STREAMING
+    _STREAMING = bool(enabled)
+    return _STREAMING
+
+
+def load_questions(theme: str) -> List[Dict]:
+    """Todas as perguntas do tema, como dicts novos.
+
+    Cada pergunta é copiada: quem chama pode alterá-las (ex.: com
+    `prepare_question()`) sem afetar o pool em cache.
+    """
+    if _DB is not None:
+        return _DB.load(theme.lower())
+    index = _cached_index(theme)
+    if isinstance(index, StreamingPool):
+        # cada leitura do NDJSON já produz dicts novos
+        return list(index)
+    return [q.copy() for q in index.items]
+
+
+def sample_questions(theme: str, rng, count: int = 3, min_difficulty: int = 1,
+                     max_difficulty: int = None, tags=(), player: str = None):
+    """Amostra `count` perguntas do tema com três alternativas em `choices`.
+
+    `max_difficulty`, `tags` e `player` (exclui as já vistas) exigem o backend
+    SQLite ativado por `use_database()`.
+    """
+    if _DB is not None:
+        selected = _DB.sample(theme.lower(), rng, count, min_difficulty, max_difficulty, tags, player)
+    elif max_difficulty is not None or tags or player is not None:
+        raise ValueError("Filtros de dificuldade máxima, tags e jogador exigem use_database()")
+    else:
+        selected = _cached_index(theme).sample(rng, count, min_difficulty)
+    if not selected:
         return []
-    rng.shuffle(pool)
-    selected = pool[:count]
-    # construir choices (três opções) preservando 'answer'
     out = []
-    for q in selected:
-        correct = str(q.get("answer"))
-        choices = [correct]
-        # gerar dois distractors simples dependendo do tema
-        if theme == "math":
-            try:
-                val = int(correct)
-            except Exception:
-                val = None
-            if val is not None:
-                # +/- small offsets
-                d1 = str(val + rng.randint(1, 5))
-                d2 = str(max(0, val - rng.randint(1, 5)))
-            else:
-                d1 = correct + "?"
-                d2 = "0"
-            choices.extend([d1, d2])
-        elif theme == "logic":
-            # corret answer is usually 'sim' or 'não'
-            alt = "não" if correct.strip().lower() == "sim" else "sim"
-            choices.extend([alt, "talvez"])
-        else:  # python
-            try:
-                val = int(correct)
-                choices.extend([str(val + rng.randint(1, 3)), str(max(0, val - rng.randint(1, 3)))])
-            except Exception:
-                choices.extend([correct + " ", "None"])
-        # shuffle choices but remember which is correct
-        rng.shuffle(choices)
+    for q, choices in zip(selected, build_choices(theme, [q.get("answer") for q in selected], rng)):
         q2 = q.copy()
         q2["choices"] = choices
-        out.append(q2)
+        out.append(prepare_question(q2))
+    return out
+
+
+def sample_quiz_sets(theme: str, rng, num_sets: int, count: int = 3, min_difficulty: int = 1,
+                     vectorized: bool = True) -> List[List[Dict]]:
+    """Pré-gera `num_sets` conjuntos de perguntas (ex.: um por sala do mapa).
+
+    As alternativas de todos os conjuntos são geradas numa única chamada a
+    `build_choices()`, vetorizada quando o NumPy está disponível. Pools em
+    streaming são lidos uma única vez para todos os conjuntos. Com o backend
+    SQLite ativo, os conjuntos vêm do banco, como em `sample_questions()`.
+    """
+    if _DB is not None:
+        sets = [_DB.sample(theme.lower(), rng, count, min_difficulty) for _ in range(num_sets)]
+    else:
+        sets = _cached_index(theme).sample_many(rng, num_sets, count, min_difficulty)
+    flat = [q for qs in sets for q in qs]
+    choices = iter(build_choices(theme, [q.get("answer") for q in flat], rng, vectorized=vectorized))
+    out = []
+    for qs in sets:
+        group = []
+        for q in qs:
+            q2 = q.copy()
+            q2["choices"] = next(choices)
+            group.append(prepare_question(q2))
+        out.append(group)
+    return out
+
+
+def build_choices(theme: str, answers, rng, vectorized: bool = False) -> List[List[str]]:
+    """Gera as três alternativas (embaralhadas) para cada resposta de `answers`.
+
+    O caminho padrão consome `rng` exatamente como a geração item a item de
+    antes, mantendo as sequências para uma mesma seed. Com `vectorized=True`
+    e NumPy disponível, temas numéricos (com `NUMERIC_SPREAD`) são gerados em
+    bloco a partir de um `numpy.random.Generator` (passado diretamente ou
+    semeado por `rng`).
+    """
+    strategy = get_theme(theme)
+    answers = [str(a) for a in answers]
+    if vectorized and answers and getattr(strategy, "NUMERIC_SPREAD", None) and _numpy() is not None:
+        return _build_choices_numpy(strategy, answers, rng)
+    distractors = strategy.distractors
+    shuffle = rng.shuffle
+    out = []
+    for correct in answers:
+        choices = [correct]
+        choices.extend(distractors(correct, rng))
+        # shuffle choices but remember which is correct
+        shuffle(choices)
+        out.append(choices)
     return out
+
+
+def _numpy():
+    """Módulo NumPy, importado na primeira chamada; None se não estiver instalado."""
+    global _np, _PERMUTATIONS
+    if _np is None:
+        try:
+            import numpy
+        except Exception:  # pragma: no cover - NumPy é opcional
+            _np = False
+        else:
+            _PERMUTATIONS = numpy.array(
+                [(0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0)], dtype=numpy.intp)
+            _np = numpy
+    return _np or None
+
+
+def _parse_ints(np, answers: List[str]):
+    """Converte as respostas em int64; devolve (valores, máscara dos numéricos)."""
+    try:
+        return np.array(list(map(int, answers)), dtype=np.int64), None
+    except (ValueError, OverflowError):
+        values = np.zeros(len(answers), dtype=np.int64)
+        mask = np.zeros(len(answers), dtype=bool)
+        for i, a in enumerate(answers):
+            try:
+                values[i] = int(a)
+                mask[i] = True
+            except (ValueError, OverflowError):
+                pass
+        return values, mask
+
+
+def _build_choices_numpy(strategy, answers: List[str], rng) -> List[List[str]]:
+    np = _np
+    gen = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng.getrandbits(64))
+    n = len(answers)
+    spread = strategy.NUMERIC_SPREAD
+    values, numeric = _parse_ints(np, answers)
+    up = values + gen.integers(1, spread + 1, n)
+    down = np.maximum(0, values - gen.integers(1, spread + 1, n))
+    rows = np.empty((n, 3), dtype=object)
+    rows[:, 0] = answers
+    rows[:, 1] = list(map(str, up.tolist()))
+    rows[:, 2] = list(map(str, down.tolist()))
+    if numeric is not None:
+        bad = np.flatnonzero(~numeric)
+        suffix, other = strategy.FALLBACK
+        for i in bad.tolist():
+            rows[i, 1] = answers[i] + suffix
+            rows[i, 2] = other
+    perms = _PERMUTATIONS[gen.integers(0, len(_PERMUTATIONS), n)]
+    return rows[np.arange(n)[:, None], perms].tolist()
+
+
+def main(argv=None):
+    import sys
+
+    argv = argv if argv is not None else sys.argv[1:]
+    if len(argv) != 2:
+        print("uso: python -m game.questions TEMA TOTAL")
+        return 2
+    theme, total = argv[0].lower(), int(argv[1])
+    if not is_theme(theme):
+        raise ValueError("Tema desconhecido: %s" % theme)
+    path = _stream_dir() / f"questions_{theme}.ndjson"
+    path.parent.mkdir(exist_ok=True)
+    n = write_pool_ndjson(path, generate_pool(theme, total))
+    print(f"{theme}: {n} perguntas -> {path} (use_streaming_pools(True) para usá-lo)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
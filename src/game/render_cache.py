@@ -0,0 +1,267 @@
+"""Caches de renderização compartilhados pelos runners pygame/pgzero.
+
+O import do pygame é protegido para que o pacote continue importável nos
+testes sem pygame; as classes só exigem pygame quando usadas.
+"""
+from collections import OrderedDict
+
+try:
+    import pygame
+except Exception:  # pragma: no cover - ambiente sem pygame
+    pygame = None
+
+
+class TiledBackgroundCache:
+    """Fundo ladrilhado pré-composto em uma única superfície.
+
+    Como o piso é periódico, basta uma superfície do tamanho da janela mais
+    um ladrilho em cada eixo: qualquer posição de câmera é coberta por um
+    único blit deslocado de `-(cam % tile)`. A superfície só é refeita quando
+    o ladrilho (identidade do objeto) ou o tamanho da janela mudam.
+    """
+
+    def __init__(self, fill=(0, 0, 0)):
+        self.fill = fill
+        self.surface = None
+        self._tile = None
+        self._key = None
+        self.rebuilds = 0
+
+    def invalidate(self):
+        self.surface = None
+        self._tile = None
+        self._key = None
+
+    def get(self, tile, view_w, view_h):
+        # guarda o próprio ladrilho (não só o id) para não confundir objetos
+        # recriados no mesmo endereço
+        key = (tile.get_size(), view_w, view_h)
+        if self.surface is None or tile is not self._tile or key != self._key:
+            tw, th = tile.get_size()
+            surf = pygame.Surface((view_w + tw, view_h + th))
+            surf.fill(self.fill)
+            for x in range(0, view_w + tw, tw):
+                for y in range(0, view_h + th, th):
+                    surf.blit(tile, (x, y))
+            self.surface = surf
+            self._tile = tile
+            self._key = key
+            self.rebuilds += 1
+        return self.surface
+
+    def blit(self, target, tile, cam_x=0, cam_y=0):
+        """Desenha o fundo em `target` para a câmera em (cam_x, cam_y)."""
+        view_w, view_h = target.get_size()
+        surf = self.get(tile, view_w, view_h)
+        tw, th = tile.get_size()
+        target.blit(surf, (-(cam_x % tw), -(cam_y % th)))
+
+
+class ChunkedLayerCache:
+    """Camada estática do mundo dividida em blocos (chunks) de tamanho fixo.
+
+    Cada chunk é rasterizado sob demanda por `render_chunk(surface, wx, wy)`,
+    que desenha o conteúdo do mundo com origem em (wx, wy) e devolve True se
+    desenhou algo (chunks vazios não guardam superfície). Mudanças no mundo
+    chamam `invalidate_rect()`, que descarta apenas os chunks afetados.
+    Os chunks mais antigos são descartados quando `max_chunks` é excedido.
+    """
+
+    def __init__(self, render_chunk, chunk_w: int = 512, chunk_h: int = 512, max_chunks: int = 32):
+        self.render_chunk = render_chunk
+        self.chunk_w = chunk_w
+        self.chunk_h = chunk_h
+        self.max_chunks = max_chunks
+        self._chunks = OrderedDict()
+        self.renders = 0
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def invalidate_all(self):
+        self._chunks.clear()
+
+    def invalidate_rect(self, x, y, w, h):
+        cx0, cy0 = int(x // self.chunk_w), int(y // self.chunk_h)
+        cx1, cy1 = int((x + w) // self.chunk_w), int((y + h) // self.chunk_h)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self._chunks.pop((cx, cy), None)
+
+    def _chunk(self, cx, cy):
+        key = (cx, cy)
+        if key in self._chunks:
+            self._chunks.move_to_end(key)
+            return self._chunks[key]
+        surf = pygame.Surface((self.chunk_w, self.chunk_h), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 0))
+        self.renders += 1
+        if not self.render_chunk(surf, cx * self.chunk_w, cy * self.chunk_h):
+            surf = None
+        self._chunks[key] = surf
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        return surf
+
+    def blit(self, target, cam_x=0, cam_y=0):
+        """Desenha os chunks visíveis para a câmera em (cam_x, cam_y)."""
+        view_w, view_h = target.get_size()
+        cw, ch = self.chunk_w, self.chunk_h
+        for cy in range(cam_y // ch, (cam_y + view_h - 1) // ch + 1):
+            for cx in range(cam_x // cw, (cam_x + view_w - 1) // cw + 1):
+                surf = self._chunk(cx, cy)
+                if surf is not None:
+                    target.blit(surf, (cx * cw - cam_x, cy * ch - cam_y))
+
+
+class TextCache:
+    """Cache LRU de superfícies de texto já rasterizadas.
+
+    A chave é (texto, fonte, cor, tamanho); textos repetidos a cada frame
+    (HUD, dicas, linhas de leitura, alternativas) viram um simples blit.
+    Sem `font`, usa a fonte padrão do pygame no tamanho pedido.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+        self._fonts = {}
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def font_for(self, size: int = 18):
+        fnt = self._fonts.get(size)
+        if fnt is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            fnt = self._fonts[size] = pygame.font.Font(None, size)
+        return fnt
+
+    def render(self, text, font=None, color=(255, 255, 255), size: int = 18, antialias: bool = True):
+        if font is None:
+            font = self.font_for(size)
+        if not isinstance(color, str):
+            color = tuple(color)
+        key = (text, font, color, size, antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, pygame.Color(color) if isinstance(color, str) else color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surf
+
+
+class MinimapCache:
+    """Superfície persistente do minimapa.
+
+    Guarda o fundo translúcido e os elementos estáticos (salas, guardiões) já
+    na escala do minimapa. Enquanto os limites do mundo não mudam, novos
+    elementos são apenas carimbados (`stamp_*`); quando `include_rect()`
+    amplia os limites a escala muda e a superfície fica suja até o próximo
+    `rebuild()`. Uma borda de `pad` pixels comporta marcadores que passam
+    um pouco da área do minimapa.
+    """
+
+    def __init__(self, width: int, height: int, backdrop=(40, 40, 60, 128), pad: int = 4):
+        self.width = width
+        self.height = height
+        self.backdrop = backdrop
+        self.pad = pad
+        self.surface = None
+        self.dirty = True
+        self.rebuilds = 0
+        self.reset_bounds()
+
+    def reset_bounds(self):
+        self.bounds = None
+        self.dirty = True
+
+    def include_rect(self, x, y, w, h) -> bool:
+        """Amplia os limites do mundo; devolve True se eles mudaram."""
+        b = self.bounds
+        new = (x, y, x + w, y + h) if b is None else (
+            min(b[0], x), min(b[1], y), max(b[2], x + w), max(b[3], y + h))
+        if new != b:
+            self.bounds = new
+            self.dirty = True
+            return True
+        return False
+
+    def _scale_origin(self, default_bounds):
+        min_x, min_y, max_x, max_y = self.bounds or default_bounds
+        world_w = max(1, max_x - min_x)
+        world_h = max(1, max_y - min_y)
+        return min(self.width / world_w, self.height / world_h), min_x, min_y
+
+    def rebuild(self, default_bounds=(0, 0, 1, 1)):
+        """Recria a superfície vazia (fundo apenas) para os limites atuais."""
+        self.scale, self.min_x, self.min_y = self._scale_origin(default_bounds)
+        pad = self.pad
+        surf = pygame.Surface((self.width + 2 * pad, self.height + 2 * pad), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 0))
+        surf.fill(self.backdrop, (pad, pad, self.width, self.height))
+        self.surface = surf
+        self.dirty = False
+        self.rebuilds += 1
+        return surf
+
+    def to_minimap(self, x, y):
+        return int((x - self.min_x) * self.scale), int((y - self.min_y) * self.scale)
+
+    def stamp_rect(self, x, y, w, h, color, min_size: int = 2):
+        if self.dirty or self.surface is None:
+            return
+        mx, my = self.to_minimap(x, y)
+        mw = max(min_size, int(w * self.scale))
+        mh = max(min_size, int(h * self.scale))
+        pygame.draw.rect(self.surface, color, (mx + self.pad, my + self.pad, mw, mh))
+
+    def stamp_circle(self, x, y, radius, color):
+        if self.dirty or self.surface is None:
+            return
+        mx, my = self.to_minimap(x, y)
+        pygame.draw.circle(self.surface, color, (mx + self.pad, my + self.pad), radius)
+
+    def blit(self, target, pos):
+        target.blit(self.surface, (pos[0] - self.pad, pos[1] - self.pad))
+
+
+class OverlayPool:
+    """Superfícies translúcidas preenchidas, criadas uma vez e reutilizadas.
+
+    Fundos de diálogo, destaques de seleção e marcadores têm poucos pares
+    (tamanho, cor) distintos; `get()` devolve sempre a mesma superfície
+    para o mesmo par. Não modifique a superfície devolvida.
+    """
+
+    def __init__(self):
+        self._surfaces = {}
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def get(self, size, rgba):
+        key = (tuple(size), tuple(rgba))
+        surf = self._surfaces.get(key)
+        if surf is None:
+            surf = pygame.Surface(key[0], pygame.SRCALPHA)
+            surf.fill(key[1])
+            self._surfaces[key] = surf
+        return surf
+
+    def prebuild(self, specs):
+        """Cria antecipadamente as superfícies para os pares (tamanho, cor)."""
+        for size, rgba in specs:
+            self.get(size, rgba)
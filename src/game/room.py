@@ -2,6 +2,7 @@
 from dataclasses import dataclass
 from typing import List
 from .book import default_books_for_room
+from .answers import is_answer_correct
 
 
 @dataclass
@@ -27,7 +28,7 @@ class Room:
         # compara com answer field
         correct = 0
         for q, a in zip(questions, answers):
-            if str(q.get("answer")).strip().lower() == str(a).strip().lower():
+            if is_answer_correct(q, a):
                 correct += 1
         if correct == len(questions):
             # pega pontos equivalentes a dificuldade média
@@ -18,6 +18,14 @@ PGZ_KEYS = getattr(pgzero, 'keys', None)
 ROOT = Path(__file__).resolve().parent.parent
 IMG_DIR = ROOT / 'src' / 'game' / 'images'
 
+# make the `game` package importable when this file is run directly by pgzrun
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+from game.spatial import SpatialGrid
+from game.render_cache import TiledBackgroundCache, ChunkedLayerCache, TextCache, MinimapCache, OverlayPool
+from game.progress import ProgressTracker
+from game.answers import prepare_questions, is_choice_correct, correct_index
+
 WIDTH, HEIGHT = 800, 600
 FPS = 60
 
@@ -48,6 +56,7 @@ class Book:
         self.text = text
         self.points = points
         self.read = False
+        self.room_id = None
 
     def rect(self):
         return pygame.Rect(self.x, self.y, self.w, self.h)
@@ -60,8 +69,10 @@ class Guardian:
         self.w = 40
         self.h = 40
         self.required_score = required_score
-        self.questions = questions or []
+        # normalize answers once so grading is an index lookup
+        self.questions = prepare_questions(questions or [])
         self.defeated = False
+        self.room_id = None
 
     def rect(self):
         return pygame.Rect(self.x, self.y, self.w, self.h)
@@ -156,13 +167,13 @@ def place_book_in_room(r, book_def: dict | None = None):
     if book_def:
         bx = r['x'] + margin + random.randint(0, max(0, r['w'] - 2*margin - book_w))
         by = r['y'] + margin + random.randint(0, max(0, r['h'] - 2*margin - book_h))
-        books.append(Book(bx, by, text=book_def.get('text', 'Livro.'), points=book_def.get('points', 1)))
+        add_book(Book(bx, by, text=book_def.get('text', 'Livro.'), points=book_def.get('points', 1)), r)
         PLACED_BOOK_IDS.add(book_def.get('id'))
     else:
         # fallback generic
         bx = r['x'] + margin + random.randint(0, max(0, r['w'] - 2*margin - book_w))
         by = r['y'] + margin + random.randint(0, max(0, r['h'] - 2*margin - book_h))
-        books.append(Book(bx, by, text='Livro gerado na sala.', points=2))
+        add_book(Book(bx, by, text='Livro gerado na sala.', points=2), r)
 
 
 def place_guardian_in_room(r, guardian_questions: list | None = None, guardian_required: int | None = None):
@@ -185,7 +196,7 @@ def place_guardian_in_room(r, guardian_questions: list | None = None, guardian_r
             guardian_questions = QUESTION_SETS[ len(guardians) % max(1, len(QUESTION_SETS)) ]
     if guardian_required is None:
         guardian_required = 0
-    guardians.append(Guardian(gx, gy, required_score=guardian_required, questions=guardian_questions))
+    add_guardian(Guardian(gx, gy, required_score=guardian_required, questions=guardian_questions), r)
 
 
 # --- Converted to Pygame Zero style: module-level state + draw/update handlers ---
@@ -198,6 +209,25 @@ GRID_MARGIN_X = 40
 GRID_MARGIN_Y = 60
 # set of occupied cells as (cx, cy)
 occupied_cells = set()
+# spatial indexes over the same grid; kept in sync with rooms/books/guardians
+# through add_room()/add_book()/add_guardian()
+room_index = SpatialGrid(GRID_CELL_W, GRID_CELL_H, GRID_MARGIN_X, GRID_MARGIN_Y)
+book_index = SpatialGrid(GRID_CELL_W, GRID_CELL_H, GRID_MARGIN_X, GRID_MARGIN_Y)
+guardian_index = SpatialGrid(GRID_CELL_W, GRID_CELL_H, GRID_MARGIN_X, GRID_MARGIN_Y)
+# half-size of the interaction square around the player
+INTERACT_RADIUS = 24
+# static world layer (rooms, books, guardians) cached in 512x512 chunks;
+# add_*/mark_* invalidate only the chunks they touch
+world_cache = ChunkedLayerCache(lambda chunk, wx, wy: render_world_chunk(chunk, wx, wy))
+# persistent minimap: rooms/guardians stamped as they change, full rebuild
+# only when the world bounds grow
+MINIMAP_W, MINIMAP_H = 180, 140
+minimap = MinimapCache(MINIMAP_W, MINIMAP_H)
+# score/progress aggregates, updated by add_book/add_guardian/mark_*
+progress = ProgressTracker()
+# ownership registry: room id -> {'room': r, 'books': [...], 'guardians': [...]}
+# filled at placement time so guardian/book lookups never rediscover rooms
+room_contents: dict[int, dict] = {}
 
 
 # We'll keep most of the original logic but expose draw()/update()/on_key_down() for pgzero.
@@ -222,6 +252,20 @@ scroll_y = 0
 read_page = 0
 font = None
 big_font = None
+# rendered text surfaces keyed by (text, font, color); HUD/dialog text is
+# rasterized once and then only blitted
+text_cache = TextCache(maxsize=512)
+# translucent dialog backdrops/highlights, reused instead of allocated per frame
+overlays = OverlayPool()
+READ_BOOK_OVERLAY = (100, 100, 100, 180)
+OVERLAY_SPECS = [
+    ((708, 308), (20, 20, 40, 200)),    # reading backdrop
+    ((728, 328), (30, 30, 60, 220)),    # guardian question backdrop
+    ((680, 28), (180, 210, 255, 255)),  # selected choice
+    ((680, 28), (200, 255, 200, 255)),  # correct choice
+    ((680, 28), (255, 200, 200, 255)),  # wrong choice
+    ((32, 32), READ_BOOK_OVERLAY),      # read book marker
+]
 g_questions: list[dict] = []
 g_choices: list[list] = []
 g_selected: list[int | None] = []
@@ -230,6 +274,8 @@ g_results: list[bool | None] = []
 result_timer = 0.0
 floor = None
 wall = None
+# floor tiles pre-composited into one surface; rebuilt when `floor` changes
+floor_cache = TiledBackgroundCache()
 player_img = None
 book_img = None
 
@@ -240,6 +286,156 @@ def world_point_to_cell(x, y):
     return cx, cy
 
 
+def add_room(r):
+    r['id'] = len(rooms)
+    rooms.append(r)
+    room_index.insert(r, r['x'], r['y'], r['w'], r['h'])
+    world_cache.invalidate_rect(r['x'], r['y'], r['w'], r['h'])
+    if not minimap.include_rect(r['x'], r['y'], r['w'], r['h']):
+        stamp_minimap_room(r)
+    room_contents[r['id']] = {'room': r, 'books': [], 'guardians': []}
+    return r
+
+
+def add_book(b, room=None):
+    """Register a book; `room` records ownership so lookups don't need geometry."""
+    books.append(b)
+    book_index.insert(b, b.x, b.y, b.w, b.h)
+    progress.add_book(b.points, read=b.read)
+    world_cache.invalidate_rect(b.x, b.y, b.w, b.h)
+    if room is not None:
+        b.room_id = room['id']
+        room_contents[b.room_id]['books'].append(b)
+    return b
+
+
+def add_guardian(g, room=None):
+    guardians.append(g)
+    guardian_index.insert(g, g.x, g.y, g.w, g.h)
+    progress.add_guardian(len(g.questions), defeated=g.defeated)
+    stamp_minimap_guardian(g)
+    world_cache.invalidate_rect(g.x, g.y, g.w, g.h)
+    if room is not None:
+        g.room_id = room['id']
+        room_contents[g.room_id]['guardians'].append(g)
+    return g
+
+
+def room_of(entity):
+    """Room dict that owns a book or guardian, or None if it was never assigned."""
+    entry = room_contents.get(entity.room_id)
+    return entry['room'] if entry else None
+
+
+def books_of(entity):
+    """Books sharing the owning room of `entity` (empty if unowned)."""
+    entry = room_contents.get(entity.room_id)
+    return entry['books'] if entry else []
+
+
+def render_world_chunk(chunk, wx, wy):
+    """Rasterize the static world (rooms, books, guardians) for one cache chunk.
+
+    Only entities intersecting the chunk are drawn; returns False when the
+    chunk is empty so the cache can skip it.
+    """
+    cw, ch = chunk.get_size()
+    drawn = False
+    # rooms
+    for r in room_index.query_rect(wx, wy, cw, ch):
+        rx = r['x'] - wx
+        ry = r['y'] - wy
+        pygame.draw.rect(chunk, (170, 170, 170), (rx, ry, r['w'], r['h']))
+        try:
+            chunk.blit(wall, (rx, ry))
+        except Exception:
+            pass
+        drawn = True
+    # books
+    for b in book_index.query_rect(wx, wy, cw, ch):
+        bx = b.x - wx
+        by = b.y - wy
+        if not b.read:
+            try:
+                chunk.blit(book_img, (bx, by))
+            except Exception:
+                pygame.draw.rect(chunk, (255, 215, 0), (bx, by, b.w, b.h))
+        else:
+            chunk.blit(overlays.get((b.w, b.h), READ_BOOK_OVERLAY), (bx, by))
+        drawn = True
+    # guardians
+    for g in guardian_index.query_rect(wx, wy, cw, ch):
+        gx = g.x - wx
+        gy = g.y - wy
+        color = (200, 50, 50) if not g.defeated else (80, 160, 80)
+        pygame.draw.rect(chunk, color, (gx, gy, g.w, g.h))
+        drawn = True
+    return drawn
+
+
+MINIMAP_ROOM_COLOR = (100, 100, 140)
+MINIMAP_GUARD_RADIUS = 3
+
+
+def minimap_guardian_color(g):
+    return (200, 50, 50) if not g.defeated else (80, 160, 80)
+
+
+def stamp_minimap_room(r):
+    minimap.stamp_rect(r['x'], r['y'], r['w'], r['h'], MINIMAP_ROOM_COLOR)
+    # guardians are drawn above rooms: re-stamp any marker the room covered
+    if not minimap.dirty:
+        slack = (MINIMAP_GUARD_RADIUS + 1) / minimap.scale
+        for g in guardian_index.query_rect(r['x'] - slack, r['y'] - slack, r['w'] + 2 * slack, r['h'] + 2 * slack):
+            minimap.stamp_circle(g.x, g.y, MINIMAP_GUARD_RADIUS, minimap_guardian_color(g))
+
+
+def stamp_minimap_guardian(g):
+    minimap.stamp_circle(g.x, g.y, MINIMAP_GUARD_RADIUS, minimap_guardian_color(g))
+    # keep later (overlapping) markers on top, as in list order
+    if not minimap.dirty:
+        reach = 2 * (MINIMAP_GUARD_RADIUS + 1) / minimap.scale
+        later = False
+        for other in guardian_index.nearby(g.x, g.y, reach):
+            if other is g:
+                later = True
+            elif later:
+                minimap.stamp_circle(other.x, other.y, MINIMAP_GUARD_RADIUS, minimap_guardian_color(other))
+
+
+def rebuild_minimap():
+    minimap.rebuild(default_bounds=(0, 0, WIDTH, HEIGHT))
+    for r in rooms:
+        minimap.stamp_rect(r['x'], r['y'], r['w'], r['h'], MINIMAP_ROOM_COLOR)
+    for g in guardians:
+        minimap.stamp_circle(g.x, g.y, MINIMAP_GUARD_RADIUS, minimap_guardian_color(g))
+
+
+def mark_book_read(b):
+    if not b.read:
+        b.read = True
+        progress.book_read(b.points)
+    world_cache.invalidate_rect(b.x, b.y, b.w, b.h)
+
+
+def mark_guardian_defeated(g):
+    if not g.defeated:
+        g.defeated = True
+        progress.guardian_defeated(len(g.questions))
+        stamp_minimap_guardian(g)
+    world_cache.invalidate_rect(g.x, g.y, g.w, g.h)
+
+
+def reset_world_index():
+    room_index.clear()
+    book_index.clear()
+    guardian_index.clear()
+    room_contents.clear()
+    world_cache.invalidate_all()
+    progress.reset()
+    minimap.reset_bounds()
+
+
 def populate_room_with_book_guard(r, book_def: dict | None = None, guardian_questions: list | None = None, guardian_required: int | None = None):
     # reuse the logic from the original; ensure QUESTION_SETS loaded
     global QUESTION_SETS, BOOK_DEF_INDEX, GUARDIAN_DEF_INDEX, GAME_BOOK_DEFS
@@ -289,7 +485,7 @@ def populate_room_with_book_guard(r, book_def: dict | None = None, guardian_ques
     if book_def:
         b_text = book_def.get('text', b_text)
         b_points = book_def.get('points', b_points)
-    books.append(Book(bx, by, text=b_text, points=b_points))
+    add_book(Book(bx, by, text=b_text, points=b_points), r)
     # ensure questions for guardian
     if guardian_questions is None:
         # prefer guardian defs from GAME_GUARDIAN_DEFS if available
@@ -307,7 +503,7 @@ def populate_room_with_book_guard(r, book_def: dict | None = None, guardian_ques
     if guardian_required is None:
         guardian_required = 0
     new_guardian = Guardian(gx, gy, required_score=guardian_required, questions=guardian_questions)
-    guardians.append(new_guardian)
+    add_guardian(new_guardian, r)
     try:
         cx, cy = world_point_to_cell(r['x'] + r.get('w', 0)//2, r['y'] + r.get('h', 0)//2)
         occupied_cells.add((cx, cy))
@@ -365,6 +561,8 @@ def load_assets():
         return load_image(name, fallback_color=fallback_color, size=size)
 
     floor = try_img('floor.png', size=(64, 64), fallback_color=(200,200,200))
+    floor_cache.invalidate()
+    world_cache.invalidate_all()
     wall = try_img('wall.png', size=(64, 64), fallback_color=(120,120,120))
     player_img = try_img('player.png', size=(32, 32), fallback_color=(30,144,255))
     book_img = try_img('book.png', size=(32, 32), fallback_color=(255,215,0))
@@ -379,6 +577,8 @@ def load_assets():
         except Exception:
             font = None
             big_font = None
+    text_cache.clear()
+    overlays.prebuild(OVERLAY_SPECS)
 
 
 def ensure_fonts():
@@ -413,9 +613,12 @@ def init_game():
     # preload question sets and full game data from game.json
     QUESTION_SETS = load_questions_from_json()
     load_game_data()
-    rooms = generate_initial_rooms(3)
+    rooms = []
     books.clear()
     guardians.clear()
+    reset_world_index()
+    for r in generate_initial_rooms(3):
+        add_room(r)
     # place books from placements if specified, ensuring they're inside rooms
     placements_books = GAME_PLACEMENTS.get('books', []) if GAME_PLACEMENTS else []
     for pb in placements_books:
@@ -426,32 +629,30 @@ def init_game():
             continue
         # find a room containing the placement
         placed = False
-        for r in rooms:
-            rr = pygame.Rect(r['x'], r['y'], r['w'], r['h'])
-            if rr.collidepoint(bx, by):
-                # place specific book at coords
-                bdef = GAME_BOOK_DEFS.get(bid) if bid else None
-                if bdef:
-                    books.append(Book(bx, by, text=bdef.get('text', 'Livro.'), points=bdef.get('points', 1)))
-                else:
-                    books.append(Book(bx, by, text='Livro gerado na sala.', points=2))
-                PLACED_BOOK_IDS.add(bid) if bid else None
-                placed = True
-                break
+        hits = room_index.query_point(bx, by)
+        if hits:
+            # place specific book at coords
+            bdef = GAME_BOOK_DEFS.get(bid) if bid else None
+            if bdef:
+                add_book(Book(bx, by, text=bdef.get('text', 'Livro.'), points=bdef.get('points', 1)), hits[0])
+            else:
+                add_book(Book(bx, by, text='Livro gerado na sala.', points=2), hits[0])
+            PLACED_BOOK_IDS.add(bid) if bid else None
+            placed = True
         if not placed:
             # create a small room around the placement and add it
             w, h = 220, 160
             x = max(50, min(int(bx - w//2), WIDTH - w - 50))
             y = max(60, min(int(by - h//2), HEIGHT - h - 60))
             new_room = {'x': x, 'y': y, 'w': w, 'h': h}
-            rooms.append(new_room)
+            add_room(new_room)
             cx, cy = world_point_to_cell(x + w//2, y + h//2)
             occupied_cells.add((cx, cy))
             bdef = GAME_BOOK_DEFS.get(bid) if bid else None
             if bdef:
-                books.append(Book(bx, by, text=bdef.get('text', 'Livro.'), points=bdef.get('points', 1)))
+                add_book(Book(bx, by, text=bdef.get('text', 'Livro.'), points=bdef.get('points', 1)), new_room)
             else:
-                books.append(Book(bx, by, text='Livro gerado na sala.', points=2))
+                add_book(Book(bx, by, text='Livro gerado na sala.', points=2), new_room)
             PLACED_BOOK_IDS.add(bid) if bid else None
 
     # place guardians from defs (ensure inside rooms)
@@ -463,28 +664,32 @@ def init_game():
         if gx is None or gy is None:
             continue
         placed = False
-        for r in rooms:
-            rr = pygame.Rect(r['x'], r['y'], r['w'], r['h'])
-            if rr.collidepoint(gx, gy):
-                guardians.append(Guardian(gx, gy, required_score=required, questions=questions))
-                placed = True
-                break
+        hits = room_index.query_point(gx, gy)
+        if hits:
+            add_guardian(Guardian(gx, gy, required_score=required, questions=questions), hits[0])
+            placed = True
         if not placed:
             # create a small room around guardian and add it
             w, h = 220, 160
             x = max(50, min(int(gx - w//2), WIDTH - w - 50))
             y = max(60, min(int(gy - h//2), HEIGHT - h - 60))
             new_room = {'x': x, 'y': y, 'w': w, 'h': h}
-            rooms.append(new_room)
+            add_room(new_room)
             cx, cy = world_point_to_cell(x + w//2, y + h//2)
             occupied_cells.add((cx, cy))
-            guardians.append(Guardian(gx, gy, required_score=required, questions=questions))
+            add_guardian(Guardian(gx, gy, required_score=required, questions=questions), new_room)
 
     # ensure every room has a book and guardian; use GAME lists where possible
+    # (geometric test: an entity of an overlapping room also counts for this one,
+    # and is listed in its room_contents so books_of() sees it too)
     for r in rooms:
-        rr = pygame.Rect(r['x'], r['y'], r['w'], r['h'])
-        has_book = any(rr.colliderect(pygame.Rect(b.x, b.y, b.w, b.h)) for b in books)
-        has_guard = any(rr.colliderect(pygame.Rect(g.x, g.y, g.w, g.h)) for g in guardians)
+        contents = room_contents[r['id']]
+        hit_books = book_index.query_rect(r['x'], r['y'], r['w'], r['h'])
+        hit_guards = guardian_index.query_rect(r['x'], r['y'], r['w'], r['h'])
+        contents['books'].extend(b for b in hit_books if b not in contents['books'])
+        contents['guardians'].extend(g for g in hit_guards if g not in contents['guardians'])
+        has_book = bool(hit_books)
+        has_guard = bool(hit_guards)
         if not has_book:
             place_book_in_room(r)
         if not has_guard:
@@ -494,10 +699,9 @@ def init_game():
 
 def handle_interact():
     global mode, active_book, read_lines, scroll_y, active_guardian, g_questions, g_choices, g_selected, g_results, g_q_index
-    pr = pygame.Rect(int(px) - 24, int(py) - 24, 48, 48)
     # check for book
-    for b in books:
-        if pr.colliderect(b.rect()) and not b.read:
+    for b in book_index.nearby(int(px), int(py), INTERACT_RADIUS):
+        if not b.read:
             mode = 'reading'
             active_book = b
             read_lines = textwrap.wrap(b.text, width=60)
@@ -506,29 +710,15 @@ def handle_interact():
             read_page = 0
             return
     # check for guardian
-    for g in guardians:
-        if pr.colliderect(g.rect()) and not g.defeated:
-            guardian_book = None
-            # First try: find the room containing the guardian and any book inside that room
-            guardian_room = None
-            for r in rooms:
-                rr = pygame.Rect(r['x'], r['y'], r['w'], r['h'])
-                # check guardian center is inside room
-                if rr.collidepoint(int(g.x + g.w / 2), int(g.y + g.h / 2)):
-                    guardian_room = r
-                    break
-            if guardian_room is not None:
-                room_rect = pygame.Rect(guardian_room['x'], guardian_room['y'], guardian_room['w'], guardian_room['h'])
-                for b in books:
-                    if room_rect.colliderect(pygame.Rect(b.x, b.y, b.w, b.h)):
-                        guardian_book = b
-                        break
+    for g in guardian_index.nearby(int(px), int(py), INTERACT_RADIUS):
+        if not g.defeated:
+            # First try: the book registered in the guardian's room
+            room_books = books_of(g)
+            guardian_book = room_books[0] if room_books else None
             # fallback: proximity check (if no book found in the same room)
             if guardian_book is None:
-                for b in books:
-                    if pygame.Rect(b.x, b.y, b.w, b.h).colliderect(pygame.Rect(g.x - 1, g.y - 1, g.w + 2, g.h + 2)):
-                        guardian_book = b
-                        break
+                hits = book_index.query_rect(g.x - 1, g.y - 1, g.w + 2, g.h + 2)
+                guardian_book = hits[0] if hits else None
             if guardian_book is None or not guardian_book.read:
                 mode = 'reading'
                 active_book = None
@@ -577,8 +767,7 @@ def update():
             reset_guard_question_state()
 
     if not show_completion:
-        remaining = len([g for g in guardians if not g.defeated])
-        if remaining == 0:
+        if progress.all_guardians_defeated():
             show_completion = True
             completion_timer = 0.0
             print('[game] player answered all guardians')
@@ -641,23 +830,11 @@ def on_key_down(key):
             total_pages = (len(read_lines) + lines_per_page - 1) // lines_per_page
             if read_page >= total_pages:
                 if active_book is not None:
-                    active_book.read = True
+                    mark_book_read(active_book)
                     player_score += active_book.points
                     # also mark any other book in the same room as read so guardian can detect it
-                    try:
-                        # find room containing the active book
-                        a_rx = None
-                        for r in rooms:
-                            rr = pygame.Rect(r['x'], r['y'], r['w'], r['h'])
-                            if rr.colliderect(pygame.Rect(active_book.x, active_book.y, active_book.w, active_book.h)):
-                                a_rx = rr
-                                break
-                        if a_rx is not None:
-                            for b2 in books:
-                                if a_rx.colliderect(pygame.Rect(b2.x, b2.y, b2.w, b2.h)):
-                                    b2.read = True
-                    except Exception:
-                        pass
+                    for b2 in books_of(active_book):
+                        mark_book_read(b2)
                 mode = 'play'
                 active_book = None
                 read_page = 0
@@ -677,15 +854,7 @@ def on_key_down(key):
             if 0 <= g_q_index < len(g_selected) and g_selected[g_q_index] is not None:
                 sel = g_selected[g_q_index]
                 q = g_questions[g_q_index]
-                try:
-                    if sel is None:
-                        is_correct = False
-                    else:
-                        choice_text = str(g_choices[g_q_index][int(sel)])
-                        is_correct = (choice_text.strip().lower() == str(q.get('answer')).strip().lower())
-                except Exception:
-                    is_correct = False
-                g_results[g_q_index] = is_correct
+                g_results[g_q_index] = is_choice_correct(q, sel)
                 # move to next unanswered question
                 next_unanswered = None
                 for idx in range(len(g_questions)):
@@ -698,17 +867,12 @@ def on_key_down(key):
                     # finished all questions
                     correct = sum(1 for r in g_results if r)
                     if active_guardian is not None:
-                        active_guardian.defeated = True
+                        mark_guardian_defeated(active_guardian)
                     awarded = sum(1 for r in g_results if r)
                     player_score += awarded
                     # spawn new room if any awarded points
                     if awarded > 0 and active_guardian is not None:
-                        base_room = None
-                        for r in rooms:
-                            rr = pygame.Rect(r['x'], r['y'], r['w'], r['h'])
-                            if rr.contains(pygame.Rect(active_guardian.x, active_guardian.y, active_guardian.w, active_guardian.h)):
-                                base_room = r
-                                break
+                        base_room = room_of(active_guardian)
                         if base_room is None and rooms:
                             base_room = random.choice(rooms)
                         if base_room is not None:
@@ -734,110 +898,55 @@ def draw():
     surf.fill((0, 0, 0))
     cam_x = int(px - WIDTH // 2)
     cam_y = int(py - HEIGHT // 2)
-    # background tiles
-    for x in range(cam_x - (cam_x % 64) - 64, cam_x + WIDTH + 64, 64):
-        for y in range(cam_y - (cam_y % 64) - 64, cam_y + HEIGHT + 64, 64):
-            sx = x - cam_x
-            sy = y - cam_y
-            try:
-                surf.blit(floor, (sx, sy))
-            except Exception:
-                pass
-    # rooms
-    for r in rooms:
-        rx = r['x'] - cam_x
-        ry = r['y'] - cam_y
-        pygame.draw.rect(surf, (170, 170, 170), (rx, ry, r['w'], r['h']))
-        try:
-            surf.blit(wall, (rx, ry))
-        except Exception:
-            pass
-    # books
-    for b in books:
-        bx = b.x - cam_x
-        by = b.y - cam_y
-        if not b.read:
-            try:
-                surf.blit(book_img, (bx, by))
-            except Exception:
-                pygame.draw.rect(surf, (255, 215, 0), (bx, by, b.w, b.h))
-        else:
-            s = pygame.Surface((b.w, b.h), pygame.SRCALPHA)
-            s.fill((100, 100, 100, 180))
-            surf.blit(s, (bx, by))
-    # guardians
-    for g in guardians:
-        gx = g.x - cam_x
-        gy = g.y - cam_y
-        color = (200, 50, 50) if not g.defeated else (80, 160, 80)
-        pygame.draw.rect(surf, color, (gx, gy, g.w, g.h))
+    # background tiles (single blit of the cached floor layer)
+    try:
+        floor_cache.blit(surf, floor, cam_x, cam_y)
+    except Exception:
+        pass
+    # rooms, books and guardians come from the cached world chunks
+    world_cache.blit(surf, cam_x, cam_y)
     # player
     try:
         surf.blit(player_img, (int(px - cam_x) - 16, int(py - cam_y) - 16))
     except Exception:
         pygame.draw.circle(surf, (30,144,255), (int(px - cam_x), int(py - cam_y)), 10)
     # HUD
-    unread_book_points = sum(b.points for b in books if not b.read)
-    remaining_questions = sum(len(g.questions) for g in guardians if not g.defeated)
-    max_possible = player_score + unread_book_points + remaining_questions
+    max_possible = progress.max_possible(player_score)
     hud_text = f'Score: {player_score}  |  Max possible: {max_possible}'
     if PGSCR is not None and hasattr(PGSCR, 'draw'):
         # choose a fontsize similar to the fonts
-        PGSCR.draw.text(hud_text, (10, 10), color='white', fontsize=24 if big_font else 18)
+        surf.blit(text_cache.render(hud_text, color='white', size=24 if big_font else 18), (10, 10))
     else:
         if big_font:
-            hud_surf = big_font.render(hud_text, True, (255,255,255))
+            hud_surf = text_cache.render(hud_text, big_font, (255,255,255))
             surf.blit(hud_surf, (10, 10))
         else:
             if font:
-                hud_surf = font.render(hud_text, True, (255,255,255))
+                hud_surf = text_cache.render(hud_text, font, (255,255,255))
                 surf.blit(hud_surf, (10,10))
     # interaction hint
-    pr = pygame.Rect(int(px) - 24, int(py) - 24, 48, 48)
     near_text = ''
-    for b in books:
-        if pr.colliderect(b.rect()) and not b.read:
+    for b in book_index.nearby(int(px), int(py), INTERACT_RADIUS):
+        if not b.read:
             near_text = 'Press E to read book'
-    for g in guardians:
-        if pr.colliderect(g.rect()) and not g.defeated:
+    for g in guardian_index.nearby(int(px), int(py), INTERACT_RADIUS):
+        if not g.defeated:
             near_text = f"Press E to talk (requires {g.required_score} pts)"
     if near_text:
         if PGSCR is not None and hasattr(PGSCR, 'draw'):
-            PGSCR.draw.text(near_text, (10, HEIGHT - 30), color='yellow', fontsize=18)
+            surf.blit(text_cache.render(near_text, color='yellow', size=18), (10, HEIGHT - 30))
         else:
             if font:
-                tip = font.render(near_text, True, (255,255,0))
+                tip = text_cache.render(near_text, font, (255,255,0))
                 surf.blit(tip, (10, HEIGHT - 30))
     # minimap (simple)
     try:
-        mm_w, mm_h = 180, 140
-        mm_x, mm_y = WIDTH - mm_w - 10, 10
-        mm_surf = pygame.Surface((mm_w, mm_h), pygame.SRCALPHA)
-        mm_surf.fill((40,40,60,128))
-        surf.blit(mm_surf, (mm_x, mm_y))
-        if rooms:
-            min_x = min(r['x'] for r in rooms)
-            min_y = min(r['y'] for r in rooms)
-            max_x = max(r['x'] + r['w'] for r in rooms)
-            max_y = max(r['y'] + r['h'] for r in rooms)
-        else:
-            min_x = 0; min_y = 0; max_x = WIDTH; max_y = HEIGHT
-        world_w = max(1, max_x - min_x)
-        world_h = max(1, max_y - min_y)
-        scale = min(mm_w / world_w, mm_h / world_h)
-        for r in rooms:
-            rx = int((r['x'] - min_x) * scale)
-            ry = int((r['y'] - min_y) * scale)
-            rw = max(2, int(r['w'] * scale))
-            rh = max(2, int(r['h'] * scale))
-            pygame.draw.rect(surf, (100,100,140), (mm_x + rx, mm_y + ry, rw, rh))
-        for g in guardians:
-            color = (200,50,50) if not g.defeated else (80,160,80)
-            gx = int((g.x - min_x) * scale)
-            gy = int((g.y - min_y) * scale)
-            pygame.draw.circle(surf, color, (mm_x + gx, mm_y + gy), 3)
-        px_mm = int((px - min_x) * scale)
-        py_mm = int((py - min_y) * scale)
+        mm_x, mm_y = WIDTH - MINIMAP_W - 10, 10
+        if minimap.dirty:
+            rebuild_minimap()
+        minimap.blit(surf, (mm_x, mm_y))
+        # only the player dot is drawn per frame
+        px_mm, py_mm = minimap.to_minimap(px, py)
         pygame.draw.circle(surf, (30,144,255), (mm_x + px_mm, mm_y + py_mm), 4)
     except Exception:
         pass
@@ -848,9 +957,7 @@ def draw():
         box_x = 50
         box_y = 120
         # semi-transparent backdrop
-        back = pygame.Surface((box_w + 8, box_h + 8), pygame.SRCALPHA)
-        back.fill((20, 20, 40, 200))
-        surf.blit(back, (box_x - 4, box_y - 4))
+        surf.blit(overlays.get((box_w + 8, box_h + 8), (20, 20, 40, 200)), (box_x - 4, box_y - 4))
         pygame.draw.rect(surf, (240, 240, 240), (box_x, box_y, box_w, box_h))
         # compute scrolling limits
         line_h = 22
@@ -862,16 +969,16 @@ def draw():
         y = box_y + 10 - scroll_y
         for line in read_lines:
             if PGSCR is not None and hasattr(PGSCR, 'draw'):
-                # pgzero draw.text expects top-left, choose fontsize
-                PGSCR.draw.text(line, (box_x + 10, y), color=(10,10,10), fontsize=18)
+                # pgzero-style sizing: default font at the given fontsize
+                surf.blit(text_cache.render(line, color=(10,10,10), size=18), (box_x + 10, y))
             else:
                 if font:
-                    img = font.render(line, True, (10, 10, 10))
+                    img = text_cache.render(line, font, (10, 10, 10))
                     surf.blit(img, (box_x + 10, y))
             y += line_h
         hint = 'Use UP/DOWN to scroll, SPACE to finish'
         if font:
-            hint_img = font.render(hint, True, (80, 80, 80))
+            hint_img = text_cache.render(hint, font, (80, 80, 80))
             surf.blit(hint_img, (box_x + 10, box_y + box_h - 30))
     # guardian question UI
     if (mode == 'guard_question' or mode == 'guard_question_results') and g_questions:
@@ -880,9 +987,7 @@ def draw():
         box_x = 40
         box_y = 80
         # backdrop with alpha
-        back = pygame.Surface((box_w + 8, box_h + 8), pygame.SRCALPHA)
-        back.fill((30, 30, 60, 220))
-        surf.blit(back, (box_x - 4, box_y - 4))
+        surf.blit(overlays.get((box_w + 8, box_h + 8), (30, 30, 60, 220)), (box_x - 4, box_y - 4))
         pygame.draw.rect(surf, (250, 250, 250), (box_x, box_y, box_w, box_h))
         # guard against invalid index
         if g_q_index < 0 or g_q_index >= len(g_questions):
@@ -896,19 +1001,20 @@ def draw():
         yoff = box_y + 10
         for ln in q_lines:
             if PGSCR is not None and hasattr(PGSCR, 'draw'):
-                PGSCR.draw.text(ln, (box_x + 10, yoff), color=(10,10,10), fontsize=24 if big_font else 18)
+                surf.blit(text_cache.render(ln, color=(10,10,10), size=24 if big_font else 18), (box_x + 10, yoff))
             else:
                 if big_font:
-                    qtxt = big_font.render(ln, True, (10, 10, 10))
+                    qtxt = text_cache.render(ln, big_font, (10, 10, 10))
                     surf.blit(qtxt, (box_x + 10, yoff))
                 else:
                     if font:
-                        qtxt = font.render(ln, True, (10, 10, 10))
+                        qtxt = text_cache.render(ln, font, (10, 10, 10))
                         surf.blit(qtxt, (box_x + 10, yoff))
             yoff += line_h
         # choices
         choices = g_choices[g_q_index]
         base_y = box_y + 20 + len(q_lines) * line_h
+        q_correct = correct_index(q)
         for i, choice in enumerate(choices):
             prefix = str(i+1) + ') '
             sel = (g_selected and g_selected[g_q_index] == i)
@@ -916,46 +1022,34 @@ def draw():
             choice_y = base_y + i * 30
             # selection highlight
             if mode == 'guard_question' and sel:
-                bg = pygame.Surface((box_w - 40, 28), pygame.SRCALPHA)
-                bg.fill((180, 210, 255, 255))
-                surf.blit(bg, (box_x + 20, choice_y - 2))
+                surf.blit(overlays.get((box_w - 40, 28), (180, 210, 255, 255)), (box_x + 20, choice_y - 2))
                 col = (10, 40, 140)
             answered = (g_results and g_results[g_q_index] is not None)
             if answered or (mode == 'guard_question_results' and g_results):
-                correct_index = None
-                ans = q.get('answer')
-                for ci, ch in enumerate(choices):
-                    if str(ch).strip().lower() == str(ans).strip().lower():
-                        correct_index = ci
-                        break
-                if correct_index is not None and i == correct_index:
-                    bg = pygame.Surface((box_w - 40, 28), pygame.SRCALPHA)
-                    bg.fill((200, 255, 200, 255))
-                    surf.blit(bg, (box_x + 20, choice_y - 2))
+                if i == q_correct:
+                    surf.blit(overlays.get((box_w - 40, 28), (200, 255, 200, 255)), (box_x + 20, choice_y - 2))
                     col = (0, 120, 0)
                 elif g_selected[g_q_index] == i and (g_results and not g_results[g_q_index]):
-                    bg = pygame.Surface((box_w - 40, 28), pygame.SRCALPHA)
-                    bg.fill((255, 200, 200, 255))
-                    surf.blit(bg, (box_x + 20, choice_y - 2))
+                    surf.blit(overlays.get((box_w - 40, 28), (255, 200, 200, 255)), (box_x + 20, choice_y - 2))
                     col = (160, 0, 0)
                 else:
                     col = (100, 100, 100)
             # draw choice text
             choice_text = prefix + str(choice)
             if PGSCR is not None and hasattr(PGSCR, 'draw'):
-                PGSCR.draw.text(choice_text, (box_x + 20, choice_y), color=col, fontsize=18)
+                surf.blit(text_cache.render(choice_text, color=col, size=18), (box_x + 20, choice_y))
             else:
                 if font:
-                    txt = font.render(choice_text, True, col)
+                    txt = text_cache.render(choice_text, font, col)
                     surf.blit(txt, (box_x + 20, choice_y))
         # footer: controls description
         controls = 'Controles: 1/2/3 = selecionar, ←/→ = navegar perguntas, Espaço = confirmar'
         ctrl_y = box_y + box_h - 28
         if PGSCR is not None and hasattr(PGSCR, 'draw'):
-            PGSCR.draw.text(controls, (box_x + 10, ctrl_y), color=(80, 80, 80), fontsize=16)
+            surf.blit(text_cache.render(controls, color=(80, 80, 80), size=16), (box_x + 10, ctrl_y))
         else:
             if font:
-                ctrl_img = font.render(controls, True, (80, 80, 80))
+                ctrl_img = text_cache.render(controls, font, (80, 80, 80))
                 surf.blit(ctrl_img, (box_x + 10, ctrl_y))
 
 
@@ -966,10 +1060,6 @@ init_game()
 # expose helper used in update when creating new rooms
 def add_adjacent_room(base_room=None, max_tries=50):
     # duplicate smaller version of original add_adjacent_room used by game logic
-    def rooms_overlap(room1, room2):
-        r1 = pygame.Rect(room1['x'], room1['y'], room1['w'], room1['h'])
-        r2 = pygame.Rect(room2['x'], room2['y'], room2['w'], room2['h'])
-        return r1.colliderect(r2)
     base = base_room or (random.choice(rooms) if rooms else None)
     if base is None:
         return None
@@ -988,8 +1078,8 @@ def add_adjacent_room(base_room=None, max_tries=50):
             if x < 50 or y < 60 or x + w > MAP_WIDTH - 50 or y + h > MAP_HEIGHT - 50:
                 continue
             new_room = {'x': x, 'y': y, 'w': w, 'h': h}
-            if not any(rooms_overlap(new_room, existing) for existing in rooms):
-                rooms.append(new_room)
+            if not room_index.any_in_rect(x, y, w, h):
+                add_room(new_room)
                 cx, cy = world_point_to_cell(x + w//2, y + h//2)
                 occupied_cells.add((cx, cy))
                 print(f'[spawn] added room at ({x},{y},{w},{h}) adjacent to base ({base["x"]},{base["y"]})')
@@ -1000,8 +1090,8 @@ def add_adjacent_room(base_room=None, max_tries=50):
         x = random.randint(50, MAP_WIDTH - w - 50)
         y = random.randint(60, MAP_HEIGHT - h - 50)
         new_room = {'x': x, 'y': y, 'w': w, 'h': h}
-        if not any(rooms_overlap(new_room, existing) for existing in rooms):
-            rooms.append(new_room)
+        if not room_index.any_in_rect(x, y, w, h):
+            add_room(new_room)
             cx, cy = world_point_to_cell(x + w//2, y + h//2)
             occupied_cells.add((cx, cy))
             print(f'[spawn] added room at ({x},{y},{w},{h}) via random placement')
@@ -0,0 +1,157 @@
+"""Índice espacial em grade uniforme para retângulos do mundo.
+
+Cada item é registrado com um retângulo (x, y, w, h) em todas as células da
+grade que ele toca. Consultas por ponto, retângulo ou vizinhança visitam apenas
+as células envolvidas, então o custo depende da densidade local e não do
+total de itens. Não depende de pygame: as regras de colisão reproduzem
+`Rect.colliderect` e `Rect.collidepoint` para que o runner obtenha os mesmos
+resultados que antes.
+
+Os resultados são sempre devolvidos na ordem de inserção, preservando o
+comportamento de código que percorria listas e usava o primeiro (ou último)
+item encontrado.
+"""
+
+
+class SpatialGrid:
+    """Grade uniforme de buckets (cx, cy) -> itens.
+
+    Itens não precisam ser hasháveis (as salas do runner são dicts); a
+    identidade é rastreada por `id(item)`.
+    """
+
+    def __init__(self, cell_w: int, cell_h: int, origin_x: int = 0, origin_y: int = 0):
+        if cell_w <= 0 or cell_h <= 0:
+            raise ValueError("Tamanho de célula inválido")
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self._cells = {}
+        # seq -> (item, x, y, w, h); seq cresce com a inserção
+        self._entries = {}
+        self._seq_by_id = {}
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        return id(item) in self._seq_by_id
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+        self._seq_by_id.clear()
+        self._next_seq = 0
+
+    def cell_of(self, x, y):
+        return (int((x - self.origin_x) // self.cell_w), int((y - self.origin_y) // self.cell_h))
+
+    def _cell_range(self, x, y, w, h):
+        # bordas inclusivas: um item encostado no limite da célula também é
+        # registrado nela, o que permite consultas com limites fechados
+        cx0, cy0 = self.cell_of(x, y)
+        cx1, cy1 = self.cell_of(x + max(0, w), y + max(0, h))
+        return cx0, cy0, cx1, cy1
+
+    def insert(self, item, x, y, w, h):
+        """Registra `item` com o retângulo dado. Reinserir atualiza a posição."""
+        if id(item) in self._seq_by_id:
+            self.remove(item)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = (item, x, y, w, h)
+        self._seq_by_id[id(item)] = seq
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cells.setdefault((cx, cy), []).append(seq)
+
+    def remove(self, item):
+        seq = self._seq_by_id.pop(id(item), None)
+        if seq is None:
+            return False
+        _, x, y, w, h = self._entries.pop(seq)
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.remove(seq)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+        return True
+
+    def _candidates(self, x, y, w, h):
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        cells = self._cells
+        found = set()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def query_rect(self, x, y, w, h):
+        """Itens cujo retângulo intersecta (x, y, w, h) — mesma regra de `colliderect`."""
+        if w <= 0 or h <= 0:
+            return []
+        out = []
+        entries = self._entries
+        for seq in self._candidates(x, y, w, h):
+            item, ix, iy, iw, ih = entries[seq]
+            if iw > 0 and ih > 0 and ix < x + w and x < ix + iw and iy < y + h and y < iy + ih:
+                out.append(item)
+        return out
+
+    def query_point(self, x, y, inclusive: bool = False):
+        """Itens que contêm o ponto.
+
+        Por padrão usa limites semiabertos como `collidepoint`; com
+        `inclusive=True` a borda direita/inferior também conta.
+        """
+        out = []
+        entries = self._entries
+        bucket = self._cells.get(self.cell_of(x, y))
+        if not bucket:
+            return out
+        # o bucket já está em ordem de inserção (seqs crescentes)
+        for seq in bucket:
+            item, ix, iy, iw, ih = entries[seq]
+            if inclusive:
+                hit = ix <= x <= ix + iw and iy <= y <= iy + ih
+            else:
+                hit = ix <= x < ix + iw and iy <= y < iy + ih
+            if hit:
+                out.append(item)
+        return out
+
+    def nearby(self, x, y, radius):
+        """Itens que intersectam o quadrado de lado 2*radius centrado em (x, y)."""
+        return self.query_rect(x - radius, y - radius, 2 * radius, 2 * radius)
+
+    def any_in_rect(self, x, y, w, h):
+        """Atalho para testes de sobreposição (ex.: posicionamento de salas).
+
+        Equivale a `bool(query_rect(...))`, mas para no primeiro item que
+        intersecta, sem montar nem ordenar a lista de candidatos.
+        """
+        if w <= 0 or h <= 0:
+            return False
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        cells = self._cells
+        entries = self._entries
+        x1, y1 = x + w, y + h
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for seq in bucket:
+                    _, ix, iy, iw, ih = entries[seq]
+                    if iw > 0 and ih > 0 and ix < x1 and x < ix + iw and iy < y1 and y < iy + ih:
+                        return True
+        return False
@@ -0,0 +1,65 @@
+"""Registro de temas de perguntas.
+
+Cada tema é um módulo que declara como gerar seu pool sintético e como criar
+distratores. O registro guarda apenas o caminho do módulo: a importação só
+acontece no primeiro uso do tema, então registrar temas não pesa na
+inicialização. As buscas são um acesso a dict.
+
+Interface de um módulo de tema:
+
+- `make_question(i) -> (pergunta, resposta, explicação)` para o item `i` (1..N);
+- `distractors(correct, rng) -> [d1, d2]`, com a resposta correta em texto;
+- opcional: `NUMERIC_SPREAD` (distratores em resposta ± 1..N) e `FALLBACK`
+  (sufixo e segundo distrator para respostas não numéricas) habilitam o
+  caminho vetorizado de `build_choices`.
+
+Registrar um tema novo:
+
+    from game import themes
+    themes.register_theme("history", "meupacote.history")
+"""
+import importlib
+from typing import Dict, List
+
+# nome -> caminho do módulo; a ordem de registro é a ordem de `THEME_NAMES`
+_REGISTRY: Dict[str, str] = {}
+_LOADED: Dict[str, object] = {}
+THEME_NAMES: List[str] = []
+
+
+def register_theme(name: str, module: str):
+    """Registra (ou substitui) o tema `name`, implementado pelo módulo `module`."""
+    name = name.lower()
+    if name not in _REGISTRY:
+        THEME_NAMES.append(name)
+    _REGISTRY[name] = module
+    _LOADED.pop(name, None)
+
+
+def unregister_theme(name: str):
+    name = name.lower()
+    if _REGISTRY.pop(name, None) is not None:
+        THEME_NAMES.remove(name)
+    _LOADED.pop(name, None)
+
+
+def get_theme(name: str):
+    """Módulo do tema, importado no primeiro acesso."""
+    theme = _LOADED.get(name)
+    if theme is None:
+        name = name.lower()
+        try:
+            module = _REGISTRY[name]
+        except KeyError:
+            raise ValueError("Tema desconhecido: %s" % name) from None
+        theme = _LOADED[name] = importlib.import_module(module)
+    return theme
+
+
+def is_theme(name: str) -> bool:
+    return name in _REGISTRY
+
+
+register_theme("math", "game.themes.math")
+register_theme("logic", "game.themes.logic")
+register_theme("python", "game.themes.python")
@@ -0,0 +1,11 @@
+"""Tema `logic`: perguntas de sim/não."""
+
+
+def make_question(i: int):
+    return f"Se A implica B e B implica C, então A implica C? (sim/não) [{i}]", "sim", "Transitividade lógica"
+
+
+def distractors(correct: str, rng):
+    # a resposta correta costuma ser 'sim' ou 'não'
+    alt = "não" if correct.strip().lower() == "sim" else "sim"
+    return [alt, "talvez"]
@@ -0,0 +1,17 @@
+"""Tema `math`: somas simples com distratores numéricos próximos."""
+
+NUMERIC_SPREAD = 5
+FALLBACK = ("?", "0")
+
+
+def make_question(i: int):
+    return f"Quanto é {i} + {i}?", str(i + i), f"Soma básica: {i}+{i}"
+
+
+def distractors(correct: str, rng):
+    try:
+        val = int(correct)
+    except Exception:
+        return [correct + "?", "0"]
+    # +/- small offsets
+    return [str(val + rng.randint(1, 5)), str(max(0, val - rng.randint(1, 5)))]
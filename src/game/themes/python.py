@@ -0,0 +1,16 @@
+"""Tema `python`: expressões cujo resultado é um número."""
+
+NUMERIC_SPREAD = 3
+FALLBACK = (" ", "None")
+
+
+def make_question(i: int):
+    return f"Qual expressão Python resulta em {i}: ' {i} ' ? (responda com {i})", str(i), "Conversão simples/string"
+
+
+def distractors(correct: str, rng):
+    try:
+        val = int(correct)
+    except Exception:
+        return [correct + " ", "None"]
+    return [str(val + rng.randint(1, 3)), str(max(0, val - rng.randint(1, 3)))]
@@ -0,0 +1,235 @@
+"""Benchmark headless e determinístico do runner pgzero (src/game/run_game_pgzero.py).
+
+Usa o driver de vídeo `dummy` do SDL, semeia `random`, cresce o mundo com
+`add_adjacent_room()` até o tamanho pedido e dirige `update()`, `draw()` e
+`on_key_down()` com uma sequência de entrada roteirizada por N frames.
+O resultado (tempos por fase em ms, média e percentis) sai em JSON.
+
+Uso:
+    python tools/bench_runner.py --rooms 10,100,1000 --frames 600 --seed 1
+    python tools/bench_runner.py --output bench.json
+    python tools/bench_runner.py --compare bench.json --tolerance 1.25
+
+Com `--compare`, o p50 de cada fase é comparado ao arquivo de referência e o
+script sai com código 1 se alguma fase ficar mais lenta que `tolerance`x.
+Observação: o mapa tem 4000x4000, então pedidos grandes param quando não há
+mais espaço livre; o JSON informa quantas salas foram de fato criadas.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+GAME_DIR = Path(__file__).resolve().parent.parent / "src" / "game"
+PHASES = ("update", "input", "draw", "frame")
+# falhas seguidas de add_adjacent_room() antes de considerar o mapa cheio
+MAX_SPAWN_FAILURES = 20
+
+
+class ScriptedKeyboard:
+    """Substitui `pgzero.keyboard`: responde às teclas marcadas como pressionadas."""
+
+    def __init__(self):
+        self.pressed = set()
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+def scripted_keys():
+    """Constantes de tecla no formato de `pgzero.keys`, mapeadas para o pygame."""
+    mapping = {
+        "LEFT": pygame.K_LEFT,
+        "RIGHT": pygame.K_RIGHT,
+        "UP": pygame.K_UP,
+        "DOWN": pygame.K_DOWN,
+        "ESCAPE": pygame.K_ESCAPE,
+        "E": pygame.K_e,
+        "SPACE": pygame.K_SPACE,
+    }
+    for i in (1, 2, 3):
+        mapping[f"K_{i}"] = getattr(pygame, f"K_{i}")
+        mapping[f"K_KP{i}"] = getattr(pygame, f"K_KP{i}")
+    return SimpleNamespace(**mapping)
+
+
+def load_runner(seed):
+    """Importa (ou recarrega) o runner com `random` semeado; o import chama init_game()."""
+    random.seed(seed)
+    if str(GAME_DIR) not in sys.path:
+        sys.path.insert(0, str(GAME_DIR))
+    with contextlib.redirect_stdout(io.StringIO()):
+        if "run_game_pgzero" in sys.modules:
+            runner = importlib.reload(sys.modules["run_game_pgzero"])
+        else:
+            runner = importlib.import_module("run_game_pgzero")
+    return runner
+
+
+def grow_world(runner, num_rooms):
+    timings = []
+    failures = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(runner.rooms) < num_rooms and failures < MAX_SPAWN_FAILURES:
+            t0 = time.perf_counter()
+            newr = runner.add_adjacent_room()
+            if newr:
+                runner.populate_room_with_book_guard(newr)
+                failures = 0
+            else:
+                failures += 1
+            timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def scripted_events(runner, frame, rng, keyboard, K):
+    """Entrada do frame: anda pelo mapa, visita livros/guardiões e responde perguntas."""
+    keyboard.pressed.clear()
+    events = []
+    if runner.mode == "play":
+        direction = (K.RIGHT, K.DOWN, K.LEFT, K.UP)[(frame // 60) % 4]
+        keyboard.pressed.add(direction)
+        if frame % 30 == 0:
+            pool = runner.books if frame % 60 == 0 else runner.guardians
+            if pool:
+                target = pool[rng.randrange(len(pool))]
+                runner.px = target.x + target.w // 2
+                runner.py = target.y + target.h // 2
+                events.append(K.E)
+    elif runner.mode == "reading":
+        if frame % 5 == 0:
+            events.append(K.SPACE)
+    elif runner.mode == "guard_question":
+        events.append(K.K_1 if frame % 2 == 0 else K.SPACE)
+    elif runner.mode == "guard_question_results" and frame % 20 == 0:
+        events.append(K.SPACE)
+    return events
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(samples):
+    values = sorted(s * 1000.0 for s in samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values),
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+        "max_ms": values[-1],
+    }
+
+
+def run_case(num_rooms, frames, seed):
+    runner = load_runner(seed)
+    spawn = grow_world(runner, num_rooms)
+    keyboard = ScriptedKeyboard()
+    K = scripted_keys()
+    runner.PGZ_KEYBOARD = keyboard
+    runner.PGZ_KEYS = K
+    rng = random.Random(seed)
+    samples = {p: [] for p in PHASES}
+    clock = time.perf_counter
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(frames):
+            events = scripted_events(runner, frame, rng, keyboard, K)
+            t0 = clock()
+            runner.update()
+            t1 = clock()
+            for key in events:
+                runner.on_key_down(key)
+            t2 = clock()
+            runner.draw()
+            pygame.display.flip()
+            t3 = clock()
+            samples["update"].append(t1 - t0)
+            samples["input"].append(t2 - t1)
+            samples["draw"].append(t3 - t2)
+            samples["frame"].append(t3 - t0)
+    return {
+        "rooms_requested": num_rooms,
+        "rooms": len(runner.rooms),
+        "books": len(runner.books),
+        "guardians": len(runner.guardians),
+        "books_read": sum(1 for b in runner.books if b.read),
+        "guardians_defeated": sum(1 for g in runner.guardians if g.defeated),
+        "score": runner.player_score,
+        "spawn": summarize(spawn),
+        "phases": {p: summarize(v) for p, v in samples.items()},
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Lista as fases cujo p50 piorou além de `tolerance` em relação ao baseline."""
+    regressions = []
+    base_cases = {c["rooms_requested"]: c for c in baseline.get("results", [])}
+    for case in report["results"]:
+        base = base_cases.get(case["rooms_requested"])
+        if base is None:
+            continue
+        for phase, stats in case["phases"].items():
+            ref = base["phases"].get(phase, {}).get("p50_ms")
+            if ref and stats.get("p50_ms", 0) > ref * tolerance:
+                regressions.append({
+                    "rooms_requested": case["rooms_requested"],
+                    "phase": phase,
+                    "p50_ms": stats["p50_ms"],
+                    "baseline_p50_ms": ref,
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", default="10,100,1000", help="tamanhos de mundo, separados por vírgula")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="grava o JSON neste arquivo além de imprimir")
+    parser.add_argument("--compare", help="JSON de referência para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    report = {
+        "seed": args.seed,
+        "frames": args.frames,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "results": [run_case(int(n), args.frames, args.seed) for n in args.rooms.split(",") if n.strip()],
+    }
+    status = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+        status = 1 if report["regressions"] else 0
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())